@@ -8,7 +8,9 @@ import logging
 import os
 import json
 import subprocess
-from typing import Dict, List, Optional, Any, Union
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, NamedTuple, Optional, Any, Union, Tuple
 from dataclasses import dataclass
 import aiohttp
 import websockets
@@ -29,6 +31,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _preview(text: str, limit: int = 100) -> str:
+    """Return text cut to limit characters, with an ellipsis if it was longer"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
 @dataclass
 class AudioDevice:
     """Audio device information"""
@@ -57,6 +64,16 @@ class AudioManager:
         self.is_playing = False
         self.volume = 50
         self.platform = self._detect_platform()
+        self.audio_switchers = {
+            "linux": self._linux_audio_switch,
+            "macos": self._macos_audio_switch,
+            "windows": self._windows_audio_switch
+        }
+        self.volume_setters = {
+            "linux": self._linux_volume_set,
+            "macos": self._macos_volume_set,
+            "windows": self._windows_volume_set
+        }
         logger.info(f"AudioManager initializing on platform: {self.platform}")
         self._discover_devices()
         self._setup_default_zones()
@@ -326,12 +343,9 @@ class AudioManager:
         """Perform platform-specific audio switching"""
         logger.debug(f"Performing {self.platform} audio switch to {device_type}")
         
-        if self.platform == "linux":
-            await self._linux_audio_switch(device_type, zone)
-        elif self.platform == "macos":
-            await self._macos_audio_switch(device_type, zone)
-        elif self.platform == "windows":
-            await self._windows_audio_switch(device_type, zone)
+        switcher = self.audio_switchers.get(self.platform)
+        if switcher:
+            await switcher(device_type, zone)
         else:
             logger.warning(f"Audio switching not implemented for platform: {self.platform}")
     
@@ -410,12 +424,9 @@ class AudioManager:
         """Perform platform-specific volume setting"""
         logger.debug(f"Performing {self.platform} volume set to {level}% for zone {zone}")
         
-        if self.platform == "linux":
-            await self._linux_volume_set(level, zone)
-        elif self.platform == "macos":
-            await self._macos_volume_set(level, zone)
-        elif self.platform == "windows":
-            await self._windows_volume_set(level, zone)
+        setter = self.volume_setters.get(self.platform)
+        if setter:
+            await setter(level, zone)
         else:
             logger.warning(f"Volume control not implemented for platform: {self.platform}")
     
@@ -458,6 +469,74 @@ class AudioManager:
         return self.zones.get(zone_name)
 
 
+class TrackTemplate(NamedTuple):
+    """Static track metadata for a music source"""
+    title_prefix: str
+    artist: str
+    album: str
+    duration: int
+    id_field: str
+    make_id: Callable[[str, int], str]  # (query, query_hash) -> source id
+    quality: str
+
+
+def _spotify_id(query: str, query_hash: int) -> str:
+    return f"spotify:track:{query_hash % 10000}"
+
+
+def _apple_id(query: str, query_hash: int) -> str:
+    return f"apple:{query_hash % 10000}"
+
+
+def _youtube_id(query: str, query_hash: int) -> str:
+    return f"YT{query_hash % 10000}"
+
+
+def _local_path(query: str, query_hash: int) -> str:
+    return f"/music/{query.replace(' ', '_')}.mp3"
+
+
+# Per-source track metadata; unknown sources use the local template
+TRACK_TEMPLATES: Dict[str, TrackTemplate] = {
+    "spotify": TrackTemplate(
+        title_prefix="Spotify Track: ",
+        artist="Spotify Artist",
+        album="Spotify Album",
+        duration=210,
+        id_field="spotify_id",
+        make_id=_spotify_id,
+        quality="320kbps"
+    ),
+    "apple": TrackTemplate(
+        title_prefix="Apple Music: ",
+        artist="Apple Music Artist",
+        album="Apple Music Album",
+        duration=195,
+        id_field="apple_id",
+        make_id=_apple_id,
+        quality="256kbps AAC"
+    ),
+    "youtube": TrackTemplate(
+        title_prefix="YouTube: ",
+        artist="YouTube Creator",
+        album="YouTube Video",
+        duration=240,
+        id_field="youtube_id",
+        make_id=_youtube_id,
+        quality="128kbps"
+    ),
+    "local": TrackTemplate(
+        title_prefix="Local Track: ",
+        artist="Local Artist",
+        album="Local Album",
+        duration=180,
+        id_field="file_path",
+        make_id=_local_path,
+        quality="FLAC"
+    ),
+}
+
+
 class MusicService:
     """Enhanced music service interface with comprehensive error handling and debugging"""
     
@@ -467,8 +546,20 @@ class MusicService:
         self.playlist = []
         self.supported_sources = ["local", "spotify", "apple", "youtube"]
         self.playback_history = []
+        self._ts_cache: Tuple[float, str] = (0.0, "")
         logger.info(f"MusicService initialized with supported sources: {self.supported_sources}")
     
+    def _now_iso(self) -> str:
+        """Return the current ISO timestamp, reused for calls within 50ms"""
+        # Age the cache on the monotonic clock so wall-clock steps can't pin it
+        now = time.monotonic()
+        cached_at, cached = self._ts_cache
+        if cached and now - cached_at < 0.05:
+            return cached
+        cached = datetime.now().isoformat()
+        self._ts_cache = (now, cached)
+        return cached
+    
     async def play(self, query: str, source: str = "local") -> Dict[str, Any]:
         """Play music based on query with enhanced error handling and debugging"""
         logger.info(f"--- Music Playback Request ---")
@@ -501,7 +592,7 @@ class MusicService:
             self.playback_history.append({
                 "query": query,
                 "track": track_info,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": self._now_iso(),
                 "source": source
             })
             
@@ -537,54 +628,22 @@ class MusicService:
         """Generate track information based on query and source"""
         logger.debug(f"Generating track info for query: '{query}', source: {source}")
         
-        # Simulate different behavior based on source
-        if source == "spotify":
-            track_info = {
-                "title": f"Spotify Track: {query}",
-                "artist": "Spotify Artist",
-                "album": "Spotify Album",
-                "duration": 210,
-                "source": source,
-                "spotify_id": f"spotify:track:{hash(query) % 10000}",
-                "quality": "320kbps"
-            }
-        elif source == "apple":
-            track_info = {
-                "title": f"Apple Music: {query}",
-                "artist": "Apple Music Artist", 
-                "album": "Apple Music Album",
-                "duration": 195,
-                "source": source,
-                "apple_id": f"apple:{hash(query) % 10000}",
-                "quality": "256kbps AAC"
-            }
-        elif source == "youtube":
-            track_info = {
-                "title": f"YouTube: {query}",
-                "artist": "YouTube Creator",
-                "album": "YouTube Video",
-                "duration": 240,
-                "source": source,
-                "youtube_id": f"YT{hash(query) % 10000}",
-                "quality": "128kbps"
-            }
-        else:  # local
-            track_info = {
-                "title": f"Local Track: {query}",
-                "artist": "Local Artist",
-                "album": "Local Album",
-                "duration": 180,
-                "source": source,
-                "file_path": f"/music/{query.replace(' ', '_')}.mp3",
-                "quality": "FLAC"
-            }
+        template = TRACK_TEMPLATES.get(source, TRACK_TEMPLATES["local"])
+        query_hash = hash(query)
         
-        # Add common metadata
-        track_info.update({
-            "id": f"{source}_{hash(query)}",
+        track_info = {
+            "title": template.title_prefix + query,
+            "artist": template.artist,
+            "album": template.album,
+            "duration": template.duration,
+            "source": source,
+            template.id_field: template.make_id(query, query_hash),
+            "quality": template.quality,
+            # Common metadata
+            "id": f"{source}_{query_hash}",
             "query": query,
-            "timestamp": datetime.now().isoformat()
-        })
+            "timestamp": self._now_iso()
+        }
         
         logger.debug(f"Generated track info: {track_info}")
         return track_info
@@ -608,8 +667,9 @@ class MusicService:
             
         except Exception as e:
             logger.error(f"--- Music Pause Failed ---")
-            logger.error(f"Error pausing playback: {e}")
-            return {"status": "error", "message": f"Error pausing playback: {str(e)}"}
+            message = f"Error pausing playback: {e}"
+            logger.error(message)
+            return {"status": "error", "message": message}
     
     async def resume(self) -> Dict[str, Any]:
         """Resume playback with enhanced logging"""
@@ -633,8 +693,9 @@ class MusicService:
             
         except Exception as e:
             logger.error(f"--- Music Resume Failed ---")
-            logger.error(f"Error resuming playback: {e}")
-            return {"status": "error", "message": f"Error resuming playback: {str(e)}"}
+            message = f"Error resuming playback: {e}"
+            logger.error(message)
+            return {"status": "error", "message": message}
     
     async def stop(self) -> Dict[str, Any]:
         """Stop playback with enhanced logging"""
@@ -655,8 +716,9 @@ class MusicService:
             
         except Exception as e:
             logger.error(f"--- Music Stop Failed ---")
-            logger.error(f"Error stopping playback: {e}")
-            return {"status": "error", "message": f"Error stopping playback: {str(e)}"}
+            message = f"Error stopping playback: {e}"
+            logger.error(message)
+            return {"status": "error", "message": message}
     
     async def get_status(self) -> Dict[str, Any]:
         """Get current playback status with comprehensive information"""
@@ -700,7 +762,10 @@ class VoiceProcessor:
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self.default_voice_id = "21m00Tcm4TlvDq8ikWAM"  # ElevenLabs default voice
         self.supported_languages = ["en", "es", "fr", "de", "it", "pt", "pl", "tr", "ru", "nl", "cs", "ar", "zh", "ja", "hi", "ko"]
-        self.tts_cache = {}  # Simple cache for TTS results
+        # LRU cache of TTS results with expiry: key -> (expires_at, result)
+        self.tts_cache: "OrderedDict[Tuple[str, str, float, str], Tuple[float, str]]" = OrderedDict()
+        self.tts_cache_max_entries = 100
+        self.tts_cache_ttl_seconds = 3600.0
         self.stt_engines = ["elevenlabs", "openai-whisper", "mock"]
         
         logger.info(f"VoiceProcessor initialized")
@@ -713,7 +778,7 @@ class VoiceProcessor:
         """Convert text to speech with enhanced error handling and debugging"""
         logger.info(f"--- Text-to-Speech Request ---")
         logger.info(f"Text length: {len(text)} characters")
-        logger.info(f"Text preview: '{text[:100]}{'...' if len(text) > 100 else ''}'")
+        logger.info(f"Text preview: '{_preview(text)}'")
         logger.info(f"Voice ID: {voice_id or self.default_voice_id}")
         logger.info(f"Speed: {speed}")
         logger.info(f"Language: {language}")
@@ -738,10 +803,11 @@ class VoiceProcessor:
             voice_id = voice_id or self.default_voice_id
             
             # Check cache first
-            cache_key = f"{hash(text)}_{voice_id}_{speed}_{language}"
-            if cache_key in self.tts_cache:
+            cache_key = self._tts_cache_key(text, voice_id, speed, language)
+            cached_result = self._get_cached_tts(cache_key)
+            if cached_result is not None:
                 logger.debug("Using cached TTS result")
-                return self.tts_cache[cache_key]
+                return cached_result
             
             # Determine TTS engine
             if self.elevenlabs_api_key:
@@ -753,12 +819,7 @@ class VoiceProcessor:
                 result = await self._mock_tts(text, voice_id, speed, language)
             
             # Cache result
-            self.tts_cache[cache_key] = result
-            if len(self.tts_cache) > 100:  # Keep cache manageable
-                # Remove oldest entries
-                keys_to_remove = list(self.tts_cache.keys())[:50]
-                for key in keys_to_remove:
-                    del self.tts_cache[key]
+            self._cache_tts(cache_key, result)
             
             logger.info(f"--- Text-to-Speech Completed Successfully ---")
             logger.info(f"Result length: {len(result)} characters")
@@ -771,6 +832,33 @@ class VoiceProcessor:
             logger.error(f"Exception type: {type(e).__name__}")
             return f"[TTS Error] {str(e)}"
     
+    @staticmethod
+    def _tts_cache_key(text: str, voice_id: str, speed: float,
+                       language: str) -> Tuple[str, str, float, str]:
+        """Build a cache key; results echo the request text, so it is kept exact"""
+        return (text, voice_id, speed, language)
+    
+    def _get_cached_tts(self, cache_key: Tuple[str, str, float, str]) -> Optional[str]:
+        """Return a cached TTS result if present and not expired"""
+        entry = self.tts_cache.get(cache_key)
+        if entry is None:
+            return None
+        
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self.tts_cache[cache_key]
+            return None
+        
+        self.tts_cache.move_to_end(cache_key)
+        return result
+    
+    def _cache_tts(self, cache_key: Tuple[str, str, float, str], result: str) -> None:
+        """Store a TTS result, evicting the least recently used entries"""
+        self.tts_cache[cache_key] = (time.monotonic() + self.tts_cache_ttl_seconds, result)
+        self.tts_cache.move_to_end(cache_key)
+        while len(self.tts_cache) > self.tts_cache_max_entries:
+            self.tts_cache.popitem(last=False)
+    
     async def _elevenlabs_tts(self, text: str, voice_id: str, speed: float, language: str) -> str:
         """ElevenLabs TTS implementation"""
         logger.debug("Using ElevenLabs TTS")
@@ -846,7 +934,7 @@ class VoiceProcessor:
             
             logger.info(f"--- Speech-to-Text Completed Successfully ---")
             logger.info(f"Transcription length: {len(result)} characters")
-            logger.info(f"Transcription preview: '{result[:100]}{'...' if len(result) > 100 else ''}'")
+            logger.info(f"Transcription preview: '{_preview(result)}'")
             
             return result
             
@@ -1076,8 +1164,9 @@ class AudioAssistantMCP(MCPServer):
             return result["message"]
             
         except Exception as e:
-            logger.error(f"Error playing music: {e}")
-            return f"Error playing music: {str(e)}"
+            message = f"Error playing music: {e}"
+            logger.error(message)
+            return message
     
     async def handle_pause(self) -> str:
         """Handle pause request"""
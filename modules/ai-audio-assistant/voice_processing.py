@@ -11,8 +11,10 @@ import json
 import io
 import base64
 import hashlib
+import math
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import Dict, List, Optional, Any, Union, Tuple, Callable
 from dataclasses import dataclass, field
 from enum import Enum
@@ -25,6 +27,11 @@ import wave
 logger = logging.getLogger(__name__)
 
 
+def _elapsed_ms(start: float) -> int:
+    """Milliseconds elapsed since a time.perf_counter() reading"""
+    return int((time.perf_counter() - start) * 1000)
+
+
 class VoiceEngine(Enum):
     """Available voice processing engines"""
     ELEVENLABS = "elevenlabs"
@@ -139,6 +146,9 @@ class VADConfig:
 class VoiceProcessorInterface(ABC):
     """Abstract interface for voice processors"""
     
+    # Engines without speech recognition override this so callers can skip them
+    SUPPORTS_STT: bool = True
+    
     @abstractmethod
     async def initialize(self) -> bool:
         """Initialize the voice processor"""
@@ -168,12 +178,30 @@ class VoiceProcessorInterface(ABC):
 class ElevenLabsProcessor(VoiceProcessorInterface):
     """ElevenLabs voice processor implementation"""
     
+    SUPPORTS_STT = False
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('ELEVENLABS_API_KEY')
         self.base_url = "https://api.elevenlabs.io/v1"
         self.initialized = False
+        self._init_lock = asyncio.Lock()
         self.voice_cache: Dict[str, VoiceProfile] = {}
-        self.request_cache: Dict[str, TTSResponse] = {}
+        self.voice_cache_ttl_seconds = 3600.0
+        self._voices_fetched_at: Optional[float] = None
+        self._voices_lock = asyncio.Lock()
+        # LRU cache of synthesized responses, most recently used last
+        self.request_cache: "OrderedDict[str, TTSResponse]" = OrderedDict()
+        self.max_cache_entries = 100
+        # Audio payloads dominate memory, so the cache is also bounded by size
+        cache_mb = os.getenv('ELEVENLABS_CACHE_MB', '64')
+        try:
+            self.max_cache_bytes = int(cache_mb) * 1024 * 1024
+        except ValueError:
+            logger.warning(f"Invalid ELEVENLABS_CACHE_MB value '{cache_mb}', using 64")
+            self.max_cache_bytes = 64 * 1024 * 1024
+        self.cache_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
         
         logger.info("ElevenLabs processor created")
     
@@ -201,16 +229,27 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
             logger.error(f"Error initializing ElevenLabs processor: {e}")
             return False
     
+    async def _ensure_initialized(self) -> bool:
+        """Initialize lazily, letting only one coroutine run the handshake"""
+        if self.initialized:
+            return True
+        async with self._init_lock:
+            if not self.initialized:
+                await self.initialize()
+        return self.initialized
+    
     async def shutdown(self) -> None:
         """Shutdown ElevenLabs processor"""
         logger.info("Shutting down ElevenLabs processor")
         self.initialized = False
         self.voice_cache.clear()
+        self._voices_fetched_at = None
         self.request_cache.clear()
+        self.cache_bytes = 0
     
     async def text_to_speech(self, request: TTSRequest) -> TTSResponse:
         """Convert text to speech using ElevenLabs"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         logger.info(f"--- ElevenLabs TTS Request ---")
         logger.info(f"Text length: {len(request.text)} characters")
@@ -218,15 +257,18 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
         logger.info(f"Speed: {request.speed}")
         
         try:
-            if not self.initialized:
+            if not await self._ensure_initialized():
                 raise Exception("ElevenLabs processor not initialized")
             
             # Check cache first
             cache_key = self._generate_tts_cache_key(request)
-            if cache_key in self.request_cache:
+            cached_response = self.request_cache.get(cache_key)
+            if cached_response is not None:
                 logger.debug("Using cached TTS result")
-                cached_response = self.request_cache[cache_key]
+                self.request_cache.move_to_end(cache_key)
+                self.cache_hits += 1
                 return cached_response
+            self.cache_misses += 1
             
             # Prepare request data
             tts_data = {
@@ -243,10 +285,12 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
             # Mock API call for now
             await asyncio.sleep(0.5)  # Simulate API latency
             
-            # Generate mock audio data
-            mock_audio_data = self._generate_mock_audio(request.text, request.voice_profile.sample_rate)
+            # Synthesizing samples is CPU-bound; keep it off the event loop
+            mock_audio_data = await asyncio.to_thread(
+                self._generate_mock_audio, request.text, request.voice_profile.sample_rate
+            )
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = _elapsed_ms(start_time)
             
             response = TTSResponse(
                 success=True,
@@ -256,13 +300,7 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
                 processing_time_ms=processing_time
             )
             
-            # Cache response
-            self.request_cache[cache_key] = response
-            if len(self.request_cache) > 100:
-                # Remove oldest entries
-                oldest_keys = list(self.request_cache.keys())[:50]
-                for key in oldest_keys:
-                    del self.request_cache[key]
+            self._cache_response(cache_key, response)
             
             logger.info(f"--- ElevenLabs TTS Completed Successfully ---")
             logger.info(f"Audio data size: {len(mock_audio_data)} bytes")
@@ -271,7 +309,7 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
             return response
             
         except Exception as e:
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = _elapsed_ms(start_time)
             logger.error(f"--- ElevenLabs TTS Failed ---")
             logger.error(f"Error: {e}")
             
@@ -300,15 +338,23 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
                 logger.warning("No API key, returning mock voices")
                 return self._get_mock_voices()
             
-            # Mock API call - in real implementation would call ElevenLabs API
-            await asyncio.sleep(0.2)
+            # Voice lists rarely change; concurrent callers share one fetch
+            if self._voices_fresh():
+                return list(self.voice_cache.values())
             
-            # Return mock voices for now
-            voices = self._get_mock_voices()
-            
-            # Cache voices
-            for voice in voices:
-                self.voice_cache[voice.id] = voice
+            async with self._voices_lock:
+                if self._voices_fresh():
+                    return list(self.voice_cache.values())
+                
+                # Mock API call - in real implementation would call ElevenLabs API
+                await asyncio.sleep(0.2)
+                
+                # Return mock voices for now
+                voices = self._get_mock_voices()
+                
+                # Cache voices
+                self.voice_cache = {voice.id: voice for voice in voices}
+                self._voices_fetched_at = time.monotonic()
             
             logger.info(f"Retrieved {len(voices)} ElevenLabs voices")
             return voices
@@ -317,6 +363,11 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
             logger.error(f"Error getting ElevenLabs voices: {e}")
             return []
     
+    def _voices_fresh(self) -> bool:
+        """Check whether the cached voice list is still within its TTL"""
+        return (self._voices_fetched_at is not None and
+                time.monotonic() - self._voices_fetched_at < self.voice_cache_ttl_seconds)
+    
     def _get_mock_voices(self) -> List[VoiceProfile]:
         """Get mock voice profiles for testing"""
         return [
@@ -349,6 +400,31 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
             )
         ]
     
+    def _cache_response(self, cache_key: str, response: TTSResponse) -> None:
+        """Cache a response, evicting least recently used entries over either bound"""
+        previous = self.request_cache.pop(cache_key, None)
+        if previous is not None:
+            self.cache_bytes -= len(previous.audio_data or b"")
+        self.request_cache[cache_key] = response
+        self.cache_bytes += len(response.audio_data or b"")
+        while self.request_cache and (len(self.request_cache) > self.max_cache_entries
+                                      or self.cache_bytes > self.max_cache_bytes):
+            _, evicted = self.request_cache.popitem(last=False)
+            self.cache_bytes -= len(evicted.audio_data or b"")
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get TTS response cache statistics"""
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            'entries': len(self.request_cache),
+            'max_entries': self.max_cache_entries,
+            'bytes': self.cache_bytes,
+            'max_bytes': self.max_cache_bytes,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / lookups if lookups else 0.0
+        }
+    
     def _generate_tts_cache_key(self, request: TTSRequest) -> str:
         """Generate cache key for TTS request"""
         key_data = f"{request.text}_{request.voice_profile.id}_{request.speed}_{request.pitch}_{request.volume}"
@@ -357,8 +433,6 @@ class ElevenLabsProcessor(VoiceProcessorInterface):
     def _generate_mock_audio(self, text: str, sample_rate: int) -> bytes:
         """Generate mock audio data for testing"""
         # Create a simple sine wave based on text length
-        import math
-        
         duration_seconds = len(text) * 0.05  # ~50ms per character
         samples = int(sample_rate * duration_seconds)
         
@@ -381,6 +455,7 @@ class OpenAIProcessor(VoiceProcessorInterface):
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         self.base_url = "https://api.openai.com/v1"
         self.initialized = False
+        self._init_lock = asyncio.Lock()
         self.request_cache: Dict[str, Union[TTSResponse, STTResponse]] = {}
         
         logger.info("OpenAI processor created")
@@ -403,6 +478,15 @@ class OpenAIProcessor(VoiceProcessorInterface):
             logger.error(f"Error initializing OpenAI processor: {e}")
             return False
     
+    async def _ensure_initialized(self) -> bool:
+        """Initialize lazily, letting only one coroutine run the handshake"""
+        if self.initialized:
+            return True
+        async with self._init_lock:
+            if not self.initialized:
+                await self.initialize()
+        return self.initialized
+    
     async def shutdown(self) -> None:
         """Shutdown OpenAI processor"""
         logger.info("Shutting down OpenAI processor")
@@ -411,14 +495,14 @@ class OpenAIProcessor(VoiceProcessorInterface):
     
     async def text_to_speech(self, request: TTSRequest) -> TTSResponse:
         """Convert text to speech using OpenAI TTS"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         logger.info(f"--- OpenAI TTS Request ---")
         logger.info(f"Text length: {len(request.text)} characters")
         logger.info(f"Voice: {request.voice_profile.name}")
         
         try:
-            if not self.initialized:
+            if not await self._ensure_initialized():
                 raise Exception("OpenAI processor not initialized")
             
             # Mock API call for now
@@ -427,7 +511,7 @@ class OpenAIProcessor(VoiceProcessorInterface):
             # Generate mock audio data
             mock_audio_data = self._generate_mock_audio(request.text)
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = _elapsed_ms(start_time)
             
             response = TTSResponse(
                 success=True,
@@ -443,7 +527,7 @@ class OpenAIProcessor(VoiceProcessorInterface):
             return response
             
         except Exception as e:
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = _elapsed_ms(start_time)
             logger.error(f"--- OpenAI TTS Failed ---")
             logger.error(f"Error: {e}")
             
@@ -456,7 +540,7 @@ class OpenAIProcessor(VoiceProcessorInterface):
     
     async def speech_to_text(self, request: STTRequest) -> STTResponse:
         """Convert speech to text using OpenAI Whisper"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         logger.info(f"--- OpenAI Whisper STT Request ---")
         logger.info(f"Audio data size: {len(request.audio_data)} bytes")
@@ -464,7 +548,7 @@ class OpenAIProcessor(VoiceProcessorInterface):
         logger.info(f"Model: {request.model}")
         
         try:
-            if not self.initialized:
+            if not await self._ensure_initialized():
                 raise Exception("OpenAI processor not initialized")
             
             # Mock API call for now
@@ -473,7 +557,7 @@ class OpenAIProcessor(VoiceProcessorInterface):
             # Generate mock transcription
             mock_text = f"[OpenAI Whisper STT] Transcribed {len(request.audio_data)} bytes of audio in {request.language}"
             
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = _elapsed_ms(start_time)
             
             response = STTResponse(
                 success=True,
@@ -501,7 +585,7 @@ class OpenAIProcessor(VoiceProcessorInterface):
             return response
             
         except Exception as e:
-            processing_time = int((time.time() - start_time) * 1000)
+            processing_time = _elapsed_ms(start_time)
             logger.error(f"--- OpenAI Whisper STT Failed ---")
             logger.error(f"Error: {e}")
             
@@ -565,6 +649,8 @@ class WakeWordDetector:
         self.detection_callback: Optional[Callable[[str], None]] = None
         self.audio_buffer = queue.Queue()
         self.detection_thread: Optional[threading.Thread] = None
+        # Frames drained from the buffer per detection pass
+        self.max_batch_frames = 32
         
         logger.info(f"Wake word detector created for words: {config.wake_words}")
     
@@ -623,8 +709,17 @@ class WakeWordDetector:
         
         while self.is_listening:
             try:
-                # Get audio data with timeout
-                audio_data = self.audio_buffer.get(timeout=0.1)
+                # Block for the first frame, then drain whatever else is queued
+                # so detection runs once per batch rather than once per frame.
+                # The mock detector never inspects audio, so frames are discarded.
+                self.audio_buffer.get(timeout=0.1)
+                drained = 1
+                while drained < self.max_batch_frames:
+                    try:
+                        self.audio_buffer.get_nowait()
+                    except queue.Empty:
+                        break
+                    drained += 1
                 
                 # Mock detection - simulate wake word detection every 10 seconds
                 current_time = time.time()
@@ -707,6 +802,7 @@ class UnifiedVoiceProcessor:
         self.default_tts_engine = VoiceEngine.ELEVENLABS
         self.default_stt_engine = VoiceEngine.OPENAI
         self.voice_profiles: Dict[str, VoiceProfile] = {}
+        self.voice_profiles_by_engine: Dict[VoiceEngine, List[VoiceProfile]] = {}
         
         logger.info("Unified voice processor created")
     
@@ -717,23 +813,27 @@ class UnifiedVoiceProcessor:
         logger.info("=== Initializing Unified Voice Processor ===")
         
         try:
-            # Initialize ElevenLabs processor
+            candidates: List[Tuple[VoiceEngine, str, VoiceProcessorInterface]] = []
             if elevenlabs_api_key or os.getenv('ELEVENLABS_API_KEY'):
-                elevenlabs_processor = ElevenLabsProcessor(elevenlabs_api_key)
-                if await elevenlabs_processor.initialize():
-                    self.processors[VoiceEngine.ELEVENLABS] = elevenlabs_processor
-                    logger.info("✓ ElevenLabs processor initialized")
-                else:
-                    logger.warning("✗ ElevenLabs processor initialization failed")
-            
-            # Initialize OpenAI processor
+                candidates.append((VoiceEngine.ELEVENLABS, "ElevenLabs",
+                                   ElevenLabsProcessor(elevenlabs_api_key)))
             if openai_api_key or os.getenv('OPENAI_API_KEY'):
-                openai_processor = OpenAIProcessor(openai_api_key)
-                if await openai_processor.initialize():
-                    self.processors[VoiceEngine.OPENAI] = openai_processor
-                    logger.info("✓ OpenAI processor initialized")
+                candidates.append((VoiceEngine.OPENAI, "OpenAI",
+                                   OpenAIProcessor(openai_api_key)))
+            
+            # Engine handshakes are independent, so run them concurrently
+            results = await asyncio.gather(
+                *(processor.initialize() for _, _, processor in candidates),
+                return_exceptions=True
+            )
+            for (engine, name, processor), result in zip(candidates, results):
+                if result is True:
+                    self.processors[engine] = processor
+                    logger.info(f"✓ {name} processor initialized")
+                elif isinstance(result, Exception):
+                    logger.warning(f"✗ {name} processor initialization failed: {result}")
                 else:
-                    logger.warning("✗ OpenAI processor initialization failed")
+                    logger.warning(f"✗ {name} processor initialization failed")
             
             # Load all available voice profiles
             await self._load_voice_profiles()
@@ -761,11 +861,14 @@ class UnifiedVoiceProcessor:
             self.wake_word_detector.stop_listening()
         
         # Shutdown all processors
-        for processor in self.processors.values():
-            await processor.shutdown()
+        await asyncio.gather(
+            *(processor.shutdown() for processor in self.processors.values()),
+            return_exceptions=True
+        )
         
         self.processors.clear()
         self.voice_profiles.clear()
+        self.voice_profiles_by_engine.clear()
         self.initialized = False
         
         logger.info("Unified voice processor shutdown complete")
@@ -814,8 +917,13 @@ class UnifiedVoiceProcessor:
         # Determine engine to use
         engine = engine or self.default_stt_engine
         
-        if engine not in self.processors:
+        processor = self.processors.get(engine)
+        if processor is None:
             return STTResponse(success=False, error=f"Engine {engine} not available")
+        if not processor.SUPPORTS_STT:
+            return STTResponse(success=False,
+                               error=f"Engine {engine} does not support speech-to-text",
+                               engine_used=engine)
         
         # Create STT request
         request = STTRequest(
@@ -829,7 +937,7 @@ class UnifiedVoiceProcessor:
         )
         
         # Process request
-        return await self.processors[engine].speech_to_text(request)
+        return await processor.speech_to_text(request)
     
     def setup_wake_word_detection(self, config: WakeWordConfig, callback: Callable[[str], None]) -> bool:
         """Setup wake word detection"""
@@ -875,7 +983,7 @@ class UnifiedVoiceProcessor:
     def get_available_voices(self, engine: Optional[VoiceEngine] = None) -> List[VoiceProfile]:
         """Get available voice profiles"""
         if engine:
-            return [v for v in self.voice_profiles.values() if v.engine == engine]
+            return list(self.voice_profiles_by_engine.get(engine, ()))
         else:
             return list(self.voice_profiles.values())
     
@@ -894,15 +1002,25 @@ class UnifiedVoiceProcessor:
     async def _load_voice_profiles(self) -> None:
         """Load voice profiles from all processors"""
         self.voice_profiles.clear()
+        self.voice_profiles_by_engine.clear()
         
-        for engine, processor in self.processors.items():
-            try:
-                voices = await processor.get_available_voices()
-                for voice in voices:
-                    self.voice_profiles[voice.id] = voice
-                logger.debug(f"Loaded {len(voices)} voices from {engine}")
-            except Exception as e:
-                logger.error(f"Error loading voices from {engine}: {e}")
+        engines = list(self.processors.keys())
+        results = await asyncio.gather(
+            *(self.processors[engine].get_available_voices() for engine in engines),
+            return_exceptions=True
+        )
+        
+        for engine, voices in zip(engines, results):
+            if isinstance(voices, Exception):
+                logger.error(f"Error loading voices from {engine}: {voices}")
+                continue
+            for voice in voices:
+                self.voice_profiles[voice.id] = voice
+            logger.debug(f"Loaded {len(voices)} voices from {engine}")
+        
+        # Per-engine index for default voice selection and filtered listings
+        for voice in self.voice_profiles.values():
+            self.voice_profiles_by_engine.setdefault(voice.engine, []).append(voice)
     
     def _get_voice_profile(self, voice_id: Optional[str], engine: VoiceEngine) -> VoiceProfile:
         """Get voice profile by ID or return default for engine"""
@@ -910,9 +1028,9 @@ class UnifiedVoiceProcessor:
             return self.voice_profiles[voice_id]
         
         # Return first voice for the engine
-        for voice in self.voice_profiles.values():
-            if voice.engine == engine:
-                return voice
+        engine_voices = self.voice_profiles_by_engine.get(engine)
+        if engine_voices:
+            return engine_voices[0]
         
         # Fallback default voice
         return VoiceProfile(
@@ -6,6 +6,7 @@ Handles system operations on Linux platforms
 import asyncio
 import logging
 import os
+import re
 import subprocess
 import json
 from typing import Dict, List, Optional, Any
@@ -28,6 +29,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Blocked command fragments, matched case-insensitively anywhere in the command
+DANGEROUS_COMMAND_RE = re.compile(r"rm|dd|mkfs|fdisk|format", re.IGNORECASE)
+
 
 @dataclass
 class ProcessInfo:
@@ -91,20 +95,24 @@ class SystemManager:
     async def get_system_info(self) -> Dict[str, Any]:
         """Get system information"""
         try:
+            # The probes are independent, so run them concurrently
+            cpu_result, mem_result, disk_result, uptime_result = await asyncio.gather(
+                self.execute_command("nproc"),
+                self.execute_command("free -m | grep '^Mem:' | awk '{print $2}'"),
+                self.execute_command("df -h / | tail -1 | awk '{print $5}'"),
+                self.execute_command("uptime -p")
+            )
+
             # Get CPU info
-            cpu_result = await self.execute_command("nproc")
             cpu_count = int(cpu_result.get("stdout", "1")) if cpu_result["success"] else 1
 
             # Get memory info
-            mem_result = await self.execute_command("free -m | grep '^Mem:' | awk '{print $2}'")
             total_memory = int(mem_result.get("stdout", "1024")) if mem_result["success"] else 1024
 
             # Get disk usage
-            disk_result = await self.execute_command("df -h / | tail -1 | awk '{print $5}'")
             disk_usage = disk_result.get("stdout", "unknown") if disk_result["success"] else "unknown"
 
             # Get uptime
-            uptime_result = await self.execute_command("uptime -p")
             uptime = uptime_result.get("stdout", "unknown") if uptime_result["success"] else "unknown"
 
             return {
@@ -140,13 +148,14 @@ class SystemManager:
                 if not line.strip():
                     continue
 
-                parts = line.split()
-                if len(parts) >= 11:
+                # Split off the ten fixed columns only; the command stays whole
+                parts = line.split(None, 10)
+                if len(parts) == 11:
                     try:
                         pid = int(parts[1])
                         cpu = float(parts[2])
                         memory = float(parts[3])
-                        name = ' '.join(parts[10:])
+                        name = parts[10]
 
                         processes.append(ProcessInfo(
                             pid=pid,
@@ -288,8 +297,7 @@ class LinuxPlatformMCP(MCPServer):
         """Handle command execution"""
         try:
             # Security check - prevent dangerous commands
-            dangerous_commands = ["rm", "dd", "mkfs", "fdisk", "format"]
-            if any(cmd in command.lower() for cmd in dangerous_commands):
+            if DANGEROUS_COMMAND_RE.search(command):
                 return "Command blocked for security reasons"
 
             result = await self.system_manager.execute_command(command, timeout)
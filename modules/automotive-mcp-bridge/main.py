@@ -8,17 +8,27 @@ safety-critical response times, and edge optimization.
 """
 
 import asyncio
-import json
 import logging
+import random
+import signal
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, List, Optional, Any, Union, Callable, Set, Coroutine
 from pathlib import Path
 import aiohttp
 import websockets
 from datetime import datetime, timedelta
-import numpy as np
+
+# Import our MCP framework
+from mcp_framework import encode_json
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +37,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Simulated sensor channels: (VehicleState field, per-update noise std,
+# lower limit, upper limit)
+SENSOR_CHANNELS = (
+    ("speed_kmh", 0.5, 0.0, float("inf")),
+    ("engine_rpm", 50.0, 0.0, 6000.0),
+    ("battery_voltage", 0.1, 11.0, 14.8)
+)
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode the enum, datetime and numpy values found in bridge responses"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    # numpy scalars and arrays, for encoders without native numpy support
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
 class AutomotiveContext(Enum):
     """Automotive-specific context states"""
@@ -45,6 +75,38 @@ class SafetyLevel(Enum):
     LOW = "low"              # Non-essential features
 
 
+# Intent -> safety level; intents not listed here are LOW
+INTENT_SAFETY_LEVELS: Dict[str, SafetyLevel] = {
+    **dict.fromkeys(("emergency", "call_emergency", "stop_vehicle"), SafetyLevel.CRITICAL),
+    **dict.fromkeys(("navigate", "call", "message", "find_location"), SafetyLevel.HIGH),
+    **dict.fromkeys(("play_music", "volume", "climate", "lights"), SafetyLevel.MEDIUM),
+}
+
+# Intent -> MCP server that executes it
+INTENT_SERVER_ROUTING: Dict[str, str] = {
+    "navigate": "navigation",
+    "call": "communication",
+    "message": "communication",
+    "play_music": "media",
+    "volume": "media",
+    "lock_doors": "vehicle_control",
+    "climate": "vehicle_control",
+    "start_engine": "vehicle_control"
+}
+
+# Execution timeout in ms per safety level
+SAFETY_LEVEL_TIMEOUTS_MS: Dict[SafetyLevel, float] = {
+    SafetyLevel.CRITICAL: 100.0,   # 100ms for critical
+    SafetyLevel.HIGH: 300.0,       # 300ms for high
+    SafetyLevel.MEDIUM: 500.0,     # 500ms for medium
+    SafetyLevel.LOW: 1000.0        # 1s for low priority
+}
+
+# Intents the safety monitor refuses in a given driving situation
+DRIVING_RESTRICTED_INTENTS = frozenset({"text_message", "email", "complex_navigation"})
+HIGH_SPEED_RESTRICTED_INTENTS = frozenset({"detailed_navigation", "media_browsing"})
+
+
 @dataclass
 class VehicleState:
     """Current vehicle state information"""
@@ -95,14 +157,22 @@ class AutomotiveMCPBridge:
         # Voice processing pipeline
         self.voice_processor = AutomotiveVoiceProcessor(config)
         
-        # Real-time metrics
+        # Strong references to background tasks so they aren't garbage collected
+        self._background_tasks: Set[asyncio.Task] = set()
+        
+        # Monotonic stamp of the last vehicle state refresh (staleness checks)
+        self._state_refreshed_at = time.monotonic()
+        self.vehicle_state_max_age_s = config.get("vehicle_state_max_age_s", 5.0)
+        self._state_refresh_lock = asyncio.Lock()
+        
+        # Real-time metrics (the average response time is derived on read)
         self.metrics = {
             "commands_processed": 0,
-            "avg_response_time_ms": 0.0,
             "safety_violations": 0,
             "voice_recognition_accuracy": 0.95,
             "system_uptime_hours": 0.0
         }
+        self._total_response_time_ms = 0.0
 
     async def initialize(self):
         """Initialize the automotive MCP bridge"""
@@ -112,16 +182,30 @@ class AutomotiveMCPBridge:
         await self.voice_processor.initialize()
         
         # Start vehicle data monitoring
-        asyncio.create_task(self._monitor_vehicle_data())
+        self._spawn(self._monitor_vehicle_data())
         
         # Start performance monitoring
-        asyncio.create_task(self._monitor_performance())
+        self._spawn(self._monitor_performance())
         
         # Initialize MCP servers
         await self._initialize_mcp_servers()
         
         logger.info("✅ Automotive MCP Bridge initialized successfully")
 
+    def _spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """Start a background task and keep it referenced until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def shutdown(self):
+        """Cancel background monitoring and wait for it to stop"""
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        logger.info("🚗 Automotive MCP Bridge background tasks stopped")
+
     async def _initialize_mcp_servers(self):
         """Initialize automotive-specific MCP servers"""
         server_configs = [
@@ -174,7 +258,7 @@ class AutomotiveMCPBridge:
 
     async def process_voice_command(self, audio_data: bytes, context: Dict[str, Any] = None) -> Dict[str, Any]:
         """Process voice command with automotive-specific optimizations"""
-        start_time = time.time()
+        start_time = time.perf_counter()
         command_id = f"cmd_{int(time.time() * 1000)}"
         
         try:
@@ -194,7 +278,7 @@ class AutomotiveMCPBridge:
                     "command_id": command_id,
                     "status": "failed",
                     "error": "Voice not recognized",
-                    "response_time_ms": (time.time() - start_time) * 1000
+                    "response_time_ms": (time.perf_counter() - start_time) * 1000
                 }
             
             # Create automotive command
@@ -215,14 +299,14 @@ class AutomotiveMCPBridge:
                     "status": "blocked",
                     "reason": safety_check["reason"],
                     "safety_level": command.safety_level.value,
-                    "response_time_ms": (time.time() - start_time) * 1000
+                    "response_time_ms": (time.perf_counter() - start_time) * 1000
                 }
             
             # Execute command through appropriate MCP server
             result = await self._execute_automotive_command(command)
             
             # Update metrics
-            response_time_ms = (time.time() - start_time) * 1000
+            response_time_ms = (time.perf_counter() - start_time) * 1000
             await self._update_metrics(command, result, response_time_ms)
             
             return {
@@ -240,25 +324,14 @@ class AutomotiveMCPBridge:
                 "command_id": command_id,
                 "status": "error",
                 "error": str(e),
-                "response_time_ms": (time.time() - start_time) * 1000
+                "response_time_ms": (time.perf_counter() - start_time) * 1000
             }
 
     async def _execute_automotive_command(self, command: AutomotiveCommand) -> Dict[str, Any]:
         """Execute automotive command through appropriate MCP server"""
         
         # Route command to appropriate MCP server based on intent
-        server_routing = {
-            "navigate": "navigation",
-            "call": "communication",
-            "message": "communication",
-            "play_music": "media",
-            "volume": "media",
-            "lock_doors": "vehicle_control",
-            "climate": "vehicle_control",
-            "start_engine": "vehicle_control"
-        }
-        
-        server_name = server_routing.get(command.intent, "navigation")
+        server_name = INTENT_SERVER_ROUTING.get(command.intent, "navigation")
         server = self.mcp_servers.get(server_name)
         
         if not server:
@@ -293,28 +366,11 @@ class AutomotiveMCPBridge:
 
     def _determine_safety_level(self, intent: str) -> SafetyLevel:
         """Determine safety level based on command intent"""
-        critical_intents = ["emergency", "call_emergency", "stop_vehicle"]
-        high_intents = ["navigate", "call", "message", "find_location"]
-        medium_intents = ["play_music", "volume", "climate", "lights"]
-        
-        if intent in critical_intents:
-            return SafetyLevel.CRITICAL
-        elif intent in high_intents:
-            return SafetyLevel.HIGH
-        elif intent in medium_intents:
-            return SafetyLevel.MEDIUM
-        else:
-            return SafetyLevel.LOW
+        return INTENT_SAFETY_LEVELS.get(intent, SafetyLevel.LOW)
 
     def _get_timeout_for_safety_level(self, safety_level: SafetyLevel) -> float:
         """Get timeout based on safety level"""
-        timeouts = {
-            SafetyLevel.CRITICAL: 100.0,   # 100ms for critical
-            SafetyLevel.HIGH: 300.0,       # 300ms for high
-            SafetyLevel.MEDIUM: 500.0,     # 500ms for medium
-            SafetyLevel.LOW: 1000.0        # 1s for low priority
-        }
-        return timeouts.get(safety_level, 500.0)
+        return SAFETY_LEVEL_TIMEOUTS_MS.get(safety_level, 500.0)
 
     async def _simulate_mcp_execution(self, server: Dict[str, Any], request: Dict[str, Any], timeout: float) -> Dict[str, Any]:
         """Simulate MCP server execution (replace with actual MCP client)"""
@@ -353,14 +409,10 @@ class AutomotiveMCPBridge:
         # In production, this would read from actual vehicle sensors
         
         # Add some realistic variation
-        self.vehicle_state.speed_kmh += np.random.normal(0, 0.5)
-        self.vehicle_state.speed_kmh = max(0, self.vehicle_state.speed_kmh)
-        
-        self.vehicle_state.engine_rpm += np.random.normal(0, 50)
-        self.vehicle_state.engine_rpm = max(0, min(6000, self.vehicle_state.engine_rpm))
-        
-        self.vehicle_state.battery_voltage += np.random.normal(0, 0.1)
-        self.vehicle_state.battery_voltage = max(11.0, min(14.8, self.vehicle_state.battery_voltage))
+        state = self.vehicle_state
+        for name, noise_std, low, high in SENSOR_CHANNELS:
+            value = getattr(state, name) + random.gauss(0.0, noise_std)
+            setattr(state, name, min(high, max(low, value)))
         
         # Update context based on speed
         if self.vehicle_state.speed_kmh > 5:
@@ -369,13 +421,22 @@ class AutomotiveMCPBridge:
             self.vehicle_state.context = AutomotiveContext.PARKED
         
         self.vehicle_state.last_update = datetime.now()
+        self._state_refreshed_at = time.monotonic()
 
     async def _update_vehicle_context(self):
         """Update vehicle context for command processing"""
         # This method would update context from various sensors
         # For now, just ensure state is recent
-        if (datetime.now() - self.vehicle_state.last_update).seconds > 5:
-            await self._update_vehicle_state()
+        if not self._vehicle_state_stale():
+            return
+        # Concurrent commands on stale state share a single sensor refresh
+        async with self._state_refresh_lock:
+            if self._vehicle_state_stale():
+                await self._update_vehicle_state()
+
+    def _vehicle_state_stale(self) -> bool:
+        """Check whether the cached vehicle state is older than its max age"""
+        return time.monotonic() - self._state_refreshed_at > self.vehicle_state_max_age_s
 
     async def _monitor_performance(self):
         """Monitor automotive MCP bridge performance"""
@@ -386,7 +447,7 @@ class AutomotiveMCPBridge:
                 
                 # Log performance metrics every minute
                 await asyncio.sleep(60)
-                logger.info(f"Performance: {self.metrics}")
+                logger.info(f"Performance: {self._metrics_snapshot()}")
                 
             except Exception as e:
                 logger.error(f"Performance monitoring error: {e}")
@@ -395,27 +456,32 @@ class AutomotiveMCPBridge:
     async def _update_metrics(self, command: AutomotiveCommand, result: Dict[str, Any], response_time_ms: float):
         """Update performance metrics"""
         self.metrics["commands_processed"] += 1
-        
-        # Update average response time
-        current_avg = self.metrics["avg_response_time_ms"]
-        count = self.metrics["commands_processed"]
-        self.metrics["avg_response_time_ms"] = (current_avg * (count - 1) + response_time_ms) / count
+        self._total_response_time_ms += response_time_ms
         
         # Check for safety violations
         if response_time_ms > command.max_response_time_ms:
             self.metrics["safety_violations"] += 1
 
+    def _metrics_snapshot(self) -> Dict[str, Any]:
+        """Get current metrics including the derived average response time"""
+        count = self.metrics["commands_processed"]
+        return {
+            **self.metrics,
+            "avg_response_time_ms": self._total_response_time_ms / count if count else 0.0
+        }
+
     async def get_system_status(self) -> Dict[str, Any]:
         """Get comprehensive system status for automotive deployment"""
+        metrics = self._metrics_snapshot()
         return {
             "bridge_status": "active",
             "vehicle_state": self.vehicle_state.__dict__,
             "mcp_servers": {name: server.get("connected", False) for name, server in self.mcp_servers.items()},
-            "metrics": self.metrics,
+            "metrics": metrics,
             "safety_monitor": await self.safety_monitor.get_status(),
             "voice_processor": await self.voice_processor.get_status(),
             "automotive_compliance": {
-                "max_response_time_met": self.metrics["avg_response_time_ms"] < 500,
+                "max_response_time_met": metrics["avg_response_time_ms"] < 500,
                 "safety_violations_low": self.metrics["safety_violations"] < 10,
                 "voice_accuracy_high": self.metrics["voice_recognition_accuracy"] > 0.9,
                 "uptime_stable": self.metrics["system_uptime_hours"] > 1
@@ -436,8 +502,7 @@ class AutomotiveSafetyMonitor:
         # Critical safety checks
         if vehicle_state.context == AutomotiveContext.DRIVING:
             # Restrict certain commands while driving
-            driving_restricted = ["text_message", "email", "complex_navigation"]
-            if command.intent in driving_restricted:
+            if command.intent in DRIVING_RESTRICTED_INTENTS:
                 return {
                     "safe": False,
                     "reason": "Command restricted while driving for safety"
@@ -453,8 +518,7 @@ class AutomotiveSafetyMonitor:
         
         # Speed-based restrictions
         if vehicle_state.speed_kmh > 50:  # Highway speeds
-            high_speed_restricted = ["detailed_navigation", "media_browsing"]
-            if command.intent in high_speed_restricted:
+            if command.intent in HIGH_SPEED_RESTRICTED_INTENTS:
                 return {
                     "safe": False,
                     "reason": "Command restricted at high speeds"
@@ -518,7 +582,8 @@ class AutomotivePerformanceMonitor:
     """Performance monitoring for automotive MCP bridge"""
     
     def __init__(self):
-        self.performance_data = []
+        # Bounded ring of the most recent samples; old entries drop off in O(1)
+        self.performance_data: "deque[Dict[str, Any]]" = deque(maxlen=1000)
         self.alert_thresholds = {
             "max_response_time_ms": 500,
             "min_accuracy": 0.9,
@@ -528,13 +593,9 @@ class AutomotivePerformanceMonitor:
     async def record_performance(self, metrics: Dict[str, Any]):
         """Record performance metrics"""
         self.performance_data.append({
-            "timestamp": datetime.now(),
+            "timestamp": time.time(),
             "metrics": metrics
         })
-        
-        # Keep only last 1000 entries
-        if len(self.performance_data) > 1000:
-            self.performance_data = self.performance_data[-1000:]
 
 
 async def main():
@@ -553,27 +614,32 @@ async def main():
     # Start web server for API endpoints
     from aiohttp import web, web_runner
     
+    def json_response(data: Any, status: int = 200) -> web.Response:
+        """JSON response encoded once to bytes (handles enums and datetimes)"""
+        return web.Response(body=encode_json(data, default=_json_default),
+                            status=status, content_type="application/json")
+    
     async def handle_voice_command(request):
         """Handle voice command API endpoint"""
         try:
             data = await request.read()
             result = await bridge.process_voice_command(data)
-            return web.json_response(result)
+            return json_response(result)
         except Exception as e:
-            return web.json_response({"error": str(e)}, status=500)
+            return json_response({"error": str(e)}, status=500)
     
     async def handle_status(request):
         """Handle status API endpoint"""
         try:
             status = await bridge.get_system_status()
-            return web.json_response(status)
+            return json_response(status)
         except Exception as e:
-            return web.json_response({"error": str(e)}, status=500)
+            return json_response({"error": str(e)}, status=500)
     
     app = web.Application()
     app.router.add_post('/api/voice/process', handle_voice_command)
     app.router.add_get('/api/status', handle_status)
-    app.router.add_get('/health', lambda r: web.json_response({"status": "healthy"}))
+    app.router.add_get('/health', lambda r: json_response({"status": "healthy"}))
     
     runner = web_runner.AppRunner(app)
     await runner.setup()
@@ -583,14 +649,26 @@ async def main():
     
     logger.info("🚗 Automotive MCP Bridge started on port 8084")
     
-    # Keep running
+    # Block until SIGINT/SIGTERM instead of waking up every second to poll
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Signal handlers are not supported by Windows event loops
+            pass
+    
     try:
-        while True:
-            await asyncio.sleep(1)
-    except KeyboardInterrupt:
+        await stop_event.wait()
         logger.info("Shutting down automotive MCP bridge")
+    finally:
+        await bridge.shutdown()
         await runner.cleanup()
 
 
 if __name__ == "__main__":
+    if UVLOOP_AVAILABLE:
+        # libuv-backed loop cuts per-await overhead on the voice/status I/O path
+        uvloop.install()
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,694 @@
+"""
+AI-SERVIS Universal: Model Context Protocol (MCP) Framework
+Core library for implementing MCP servers and clients
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Union, Callable, Awaitable
+from enum import Enum
+import websockets
+import aiohttp
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Logging setup
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = "2024-11-05"
+
+# Static capability blocks sent during the initialize handshake; shared
+# across calls, so treat them as read-only
+SERVER_CAPABILITIES: Dict[str, Any] = {
+    "tools": {"listChanged": True},
+    "resources": {"subscribe": True, "listChanged": True},
+    "prompts": {"listChanged": True},
+    "logging": {}
+}
+CLIENT_CAPABILITIES: Dict[str, Any] = {
+    "tools": {},
+    "resources": {},
+    "prompts": {}
+}
+
+
+def encode_json(data: Any, default: Optional[Callable[[Any], Any]] = None,
+                indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed
+
+    default converts values the encoder does not know; indent pretty-prints
+    with two spaces.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=option)
+    text = json.dumps(data, default=default, indent=2 if indent else None)
+    return text.encode("utf-8")
+
+
+def decode_json(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class MessageType(str, Enum):
+    """MCP message types"""
+    INITIALIZE = "initialize"
+    INITIALIZED = "initialized"
+    SHUTDOWN = "shutdown"
+    PING = "ping"
+    PONG = "pong"
+    TOOLS_LIST = "tools/list"
+    TOOLS_CALL = "tools/call"
+    RESOURCES_LIST = "resources/list"
+    RESOURCES_READ = "resources/read"
+    PROMPTS_LIST = "prompts/list"
+    PROMPTS_GET = "prompts/get"
+    NOTIFICATION = "notification"
+    LOG = "log"
+
+
+class LogLevel(str, Enum):
+    """Log levels for MCP logging"""
+    DEBUG = "debug"
+    INFO = "info"
+    WARNING = "warning"
+    ERROR = "error"
+
+
+@dataclass
+class MCPMessage:
+    """Base MCP message structure"""
+    jsonrpc: str = "2.0"
+    id: Optional[Union[str, int]] = None
+    method: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    result: Optional[Any] = None
+    error: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert message to dictionary"""
+        data = {}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.method is not None:
+            data["method"] = self.method
+        if self.params is not None:
+            data["params"] = self.params
+        if self.result is not None:
+            data["result"] = self.result
+        if self.error is not None:
+            data["error"] = self.error
+        data["jsonrpc"] = self.jsonrpc
+        return data
+
+    def to_json(self) -> str:
+        """Convert message to JSON string"""
+        return encode_json(self.to_dict()).decode("utf-8")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MCPMessage':
+        """Create message from dictionary"""
+        return cls(
+            jsonrpc=data.get("jsonrpc", "2.0"),
+            id=data.get("id"),
+            method=data.get("method"),
+            params=data.get("params"),
+            result=data.get("result"),
+            error=data.get("error")
+        )
+
+    @classmethod
+    def from_json(cls, json_str: Union[str, bytes]) -> 'MCPMessage':
+        """Create message from JSON string"""
+        return cls.from_dict(decode_json(json_str))
+
+
+@dataclass
+class Tool:
+    """MCP Tool definition"""
+    name: str
+    description: str
+    inputSchema: Dict[str, Any]
+    handler: Optional[Callable] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert tool to dictionary for JSON serialization"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "inputSchema": self.inputSchema
+        }
+
+
+@dataclass
+class Resource:
+    """MCP Resource definition"""
+    uri: str
+    name: str
+    description: str
+    mimeType: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert resource to dictionary"""
+        data = {
+            "uri": self.uri,
+            "name": self.name,
+            "description": self.description
+        }
+        if self.mimeType:
+            data["mimeType"] = self.mimeType
+        return data
+
+
+@dataclass
+class Prompt:
+    """MCP Prompt definition"""
+    name: str
+    description: str
+    arguments: Optional[List[Dict[str, Any]]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert prompt to dictionary"""
+        data = {
+            "name": self.name,
+            "description": self.description
+        }
+        if self.arguments:
+            data["arguments"] = self.arguments
+        return data
+
+
+class MCPError(Exception):
+    """Base MCP error"""
+    def __init__(self, code: int, message: str, data: Optional[Any] = None):
+        self.code = code
+        self.message = message
+        self.data = data
+        super().__init__(f"MCP Error {code}: {message}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert error to dictionary"""
+        error = {"code": self.code, "message": self.message}
+        if self.data is not None:
+            error["data"] = self.data
+        return error
+
+
+class MCPTransport(ABC):
+    """Abstract base class for MCP transport layers"""
+
+    @abstractmethod
+    async def send(self, message: MCPMessage) -> None:
+        """Send a message"""
+        pass
+
+    @abstractmethod
+    async def receive(self) -> MCPMessage:
+        """Receive a message"""
+        pass
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Close the transport"""
+        pass
+
+
+class WebSocketTransport(MCPTransport):
+    """WebSocket transport for MCP"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+
+    async def send(self, message: MCPMessage) -> None:
+        """Send message via WebSocket"""
+        await self.websocket.send(message.to_json())
+
+    async def receive(self) -> MCPMessage:
+        """Receive message via WebSocket"""
+        data = await self.websocket.recv()
+        return MCPMessage.from_json(data)
+
+    async def close(self) -> None:
+        """Close WebSocket connection"""
+        await self.websocket.close()
+
+
+class HTTPTransport(MCPTransport):
+    """HTTP transport for MCP"""
+
+    def __init__(self, session: aiohttp.ClientSession, url: str):
+        self.session = session
+        self.url = url
+
+    async def send(self, message: MCPMessage) -> None:
+        """Send message via HTTP POST"""
+        async with self.session.post(
+            self.url,
+            data=encode_json(message.to_dict()),
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            # Any 2xx is a successful delivery (servers commonly answer 202/204)
+            if response.status // 100 != 2:
+                raise MCPError(-32603, f"HTTP error: {response.status}")
+
+    async def receive(self) -> MCPMessage:
+        """HTTP transport doesn't support receiving (request/response only)"""
+        raise NotImplementedError("HTTP transport doesn't support receiving")
+
+    async def close(self) -> None:
+        """Close HTTP session"""
+        await self.session.close()
+
+
+# Coroutine that answers one MCP request
+MethodHandler = Callable[[MCPMessage], Awaitable[MCPMessage]]
+
+
+class MCPServer:
+    """MCP Server implementation"""
+
+    def __init__(self, name: str, version: str = "1.0.0"):
+        self.name = name
+        self.version = version
+        self.tools: Dict[str, Tool] = {}
+        self.resources: Dict[str, Resource] = {}
+        self.prompts: Dict[str, Prompt] = {}
+        self.transport: Optional[MCPTransport] = None
+        self.initialized = False
+        self.running = False
+        # Serialized */list payloads, rebuilt only after a registration
+        self._tools_list: Optional[List[Dict[str, Any]]] = None
+        self._resources_list: Optional[List[Dict[str, Any]]] = None
+        self._prompts_list: Optional[List[Dict[str, Any]]] = None
+        # Method name -> handler, keyed by the plain string value of MessageType
+        self._method_handlers: Dict[str, MethodHandler] = {
+            MessageType.INITIALIZE.value: self._handle_initialize,
+            MessageType.TOOLS_LIST.value: self._handle_tools_list,
+            MessageType.TOOLS_CALL.value: self._handle_tools_call,
+            MessageType.RESOURCES_LIST.value: self._handle_resources_list,
+            MessageType.RESOURCES_READ.value: self._handle_resources_read,
+            MessageType.PROMPTS_LIST.value: self._handle_prompts_list,
+            MessageType.PROMPTS_GET.value: self._handle_prompts_get,
+            MessageType.PING.value: self._handle_ping,
+            MessageType.SHUTDOWN.value: self._handle_shutdown,
+        }
+
+    def add_tool(self, tool: Tool) -> None:
+        """Add a tool to the server"""
+        self.tools[tool.name] = tool
+        self._tools_list = None
+        logger.info(f"Added tool: {tool.name}")
+
+    def add_resource(self, resource: Resource) -> None:
+        """Add a resource to the server"""
+        self.resources[resource.uri] = resource
+        self._resources_list = None
+        logger.info(f"Added resource: {resource.uri}")
+
+    def add_prompt(self, prompt: Prompt) -> None:
+        """Add a prompt to the server"""
+        self.prompts[prompt.name] = prompt
+        self._prompts_list = None
+        logger.info(f"Added prompt: {prompt.name}")
+
+    async def handle_message(self, message: MCPMessage) -> Optional[MCPMessage]:
+        """Handle incoming MCP message"""
+        try:
+            # Messages built in-process may carry the MessageType member itself
+            method = getattr(message.method, "value", message.method)
+            handler = self._method_handlers.get(method)
+            if handler is None:
+                return MCPMessage(
+                    id=message.id,
+                    error=MCPError(-32601, f"Method not found: {message.method}").to_dict()
+                )
+            return await handler(message)
+        except Exception as e:
+            logger.error(f"Error handling message: {e}")
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32603, f"Internal error: {str(e)}").to_dict()
+            )
+
+    async def _handle_initialize(self, message: MCPMessage) -> MCPMessage:
+        """Handle initialize request"""
+        self.initialized = True
+        return MCPMessage(
+            id=message.id,
+            result={
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": SERVER_CAPABILITIES,
+                "serverInfo": {
+                    "name": self.name,
+                    "version": self.version
+                }
+            }
+        )
+
+    async def _handle_tools_list(self, message: MCPMessage) -> MCPMessage:
+        """Handle tools/list request"""
+        if self._tools_list is None:
+            self._tools_list = [tool.to_dict() for tool in self.tools.values()]
+        return MCPMessage(
+            id=message.id,
+            result={"tools": self._tools_list}
+        )
+
+    async def _handle_tools_call(self, message: MCPMessage) -> MCPMessage:
+        """Handle tools/call request"""
+        if not message.params:
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32602, "Missing parameters").to_dict()
+            )
+
+        tool_name = message.params.get("name")
+        tool_arguments = message.params.get("arguments", {})
+
+        if tool_name not in self.tools:
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32602, f"Tool not found: {tool_name}").to_dict()
+            )
+
+        tool = self.tools[tool_name]
+        if not tool.handler:
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32603, f"Tool handler not implemented: {tool_name}").to_dict()
+            )
+
+        try:
+            # Execute tool handler
+            if asyncio.iscoroutinefunction(tool.handler):
+                result = await tool.handler(**tool_arguments)
+            else:
+                result = tool.handler(**tool_arguments)
+
+            return MCPMessage(
+                id=message.id,
+                result={
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": str(result)
+                        }
+                    ]
+                }
+            )
+        except Exception as e:
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32603, f"Tool execution error: {str(e)}").to_dict()
+            )
+
+    async def _handle_resources_list(self, message: MCPMessage) -> MCPMessage:
+        """Handle resources/list request"""
+        if self._resources_list is None:
+            self._resources_list = [
+                resource.to_dict() for resource in self.resources.values()
+            ]
+        return MCPMessage(
+            id=message.id,
+            result={"resources": self._resources_list}
+        )
+
+    async def _handle_resources_read(self, message: MCPMessage) -> MCPMessage:
+        """Handle resources/read request"""
+        if not message.params:
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32602, "Missing parameters").to_dict()
+            )
+
+        uri = message.params.get("uri")
+        if uri not in self.resources:
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32602, f"Resource not found: {uri}").to_dict()
+            )
+
+        # In a real implementation, you would read the actual resource content
+        return MCPMessage(
+            id=message.id,
+            result={
+                "contents": [
+                    {
+                        "uri": uri,
+                        "mimeType": self.resources[uri].mimeType or "text/plain",
+                        "text": f"Resource content for {uri}"
+                    }
+                ]
+            }
+        )
+
+    async def _handle_prompts_list(self, message: MCPMessage) -> MCPMessage:
+        """Handle prompts/list request"""
+        if self._prompts_list is None:
+            self._prompts_list = [
+                prompt.to_dict() for prompt in self.prompts.values()
+            ]
+        return MCPMessage(
+            id=message.id,
+            result={"prompts": self._prompts_list}
+        )
+
+    async def _handle_prompts_get(self, message: MCPMessage) -> MCPMessage:
+        """Handle prompts/get request"""
+        if not message.params:
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32602, "Missing parameters").to_dict()
+            )
+
+        name = message.params.get("name")
+        if name not in self.prompts:
+            return MCPMessage(
+                id=message.id,
+                error=MCPError(-32602, f"Prompt not found: {name}").to_dict()
+            )
+
+        return MCPMessage(
+            id=message.id,
+            result={
+                "description": self.prompts[name].description,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": {
+                            "type": "text",
+                            "text": f"Prompt: {name}"
+                        }
+                    }
+                ]
+            }
+        )
+
+    async def _handle_ping(self, message: MCPMessage) -> MCPMessage:
+        """Handle ping request"""
+        return MCPMessage(
+            id=message.id,
+            result={}
+        )
+
+    async def _handle_shutdown(self, message: MCPMessage) -> MCPMessage:
+        """Handle shutdown request"""
+        self.running = False
+        return MCPMessage(
+            id=message.id,
+            result={}
+        )
+
+    async def serve(self, transport: MCPTransport) -> None:
+        """Serve MCP requests using the provided transport"""
+        self.transport = transport
+        self.running = True
+        logger.info(f"MCP Server '{self.name}' started")
+
+        try:
+            while self.running:
+                try:
+                    message = await transport.receive()
+                    response = await self.handle_message(message)
+                    if response:
+                        await transport.send(response)
+                except websockets.exceptions.ConnectionClosed:
+                    logger.info("Connection closed")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in serve loop: {e}")
+                    break
+        finally:
+            await transport.close()
+            logger.info(f"MCP Server '{self.name}' stopped")
+
+
+class MCPClient:
+    """MCP Client implementation"""
+
+    def __init__(self):
+        self.transport: Optional[MCPTransport] = None
+        self.request_id = 0
+        self.pending_requests: Dict[Union[str, int], asyncio.Future] = {}
+
+    def _next_id(self) -> int:
+        """Generate next request ID"""
+        self.request_id += 1
+        return self.request_id
+
+    async def connect(self, transport: MCPTransport) -> None:
+        """Connect to MCP server"""
+        self.transport = transport
+        await self.initialize()
+
+    async def initialize(self) -> Dict[str, Any]:
+        """Initialize connection with server"""
+        if not self.transport:
+            raise MCPError(-32603, "Not connected to transport")
+
+        request = MCPMessage(
+            id=self._next_id(),
+            method=MessageType.INITIALIZE,
+            params={
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": CLIENT_CAPABILITIES,
+                "clientInfo": {
+                    "name": "ai-servis-client",
+                    "version": "1.0.0"
+                }
+            }
+        )
+
+        response = await self._send_request(request)
+        return response.result
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """List available tools"""
+        request = MCPMessage(
+            id=self._next_id(),
+            method=MessageType.TOOLS_LIST
+        )
+        response = await self._send_request(request)
+        return response.result.get("tools", [])
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool"""
+        request = MCPMessage(
+            id=self._next_id(),
+            method=MessageType.TOOLS_CALL,
+            params={
+                "name": name,
+                "arguments": arguments
+            }
+        )
+        response = await self._send_request(request)
+        return response.result
+
+    async def _send_request(self, request: MCPMessage) -> MCPMessage:
+        """Send request and wait for response"""
+        if not self.transport:
+            raise MCPError(-32603, "Not connected to transport")
+
+        future = asyncio.Future()
+        self.pending_requests[request.id] = future
+
+        await self.transport.send(request)
+        response = await future
+
+        if response.error:
+            raise MCPError(
+                response.error.get("code", -32603),
+                response.error.get("message", "Unknown error"),
+                response.error.get("data")
+            )
+
+        return response
+
+    async def _handle_response(self, message: MCPMessage) -> None:
+        """Handle response message"""
+        if message.id in self.pending_requests:
+            future = self.pending_requests.pop(message.id)
+            future.set_result(message)
+
+    async def close(self) -> None:
+        """Close client connection"""
+        if self.transport:
+            await self.transport.close()
+
+
+# Utility functions
+def create_tool(name: str, description: str, schema: Dict[str, Any], 
+                handler: Callable) -> Tool:
+    """Helper function to create a tool"""
+    return Tool(
+        name=name,
+        description=description,
+        inputSchema=schema,
+        handler=handler
+    )
+
+
+def create_resource(uri: str, name: str, description: str, 
+                   mime_type: Optional[str] = None) -> Resource:
+    """Helper function to create a resource"""
+    return Resource(
+        uri=uri,
+        name=name,
+        description=description,
+        mimeType=mime_type
+    )
+
+
+def create_prompt(name: str, description: str, 
+                 arguments: Optional[List[Dict[str, Any]]] = None) -> Prompt:
+    """Helper function to create a prompt"""
+    return Prompt(
+        name=name,
+        description=description,
+        arguments=arguments
+    )
+
+
+# Example usage and testing
+if __name__ == "__main__":
+    async def example_tool_handler(query: str, max_results: int = 10) -> str:
+        """Example tool handler"""
+        return f"Processed query '{query}' with max_results={max_results}"
+
+    # Create server
+    server = MCPServer("example-server", "1.0.0")
+    
+    # Add example tool
+    tool = create_tool(
+        name="search",
+        description="Search for information",
+        schema={
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query"},
+                "max_results": {"type": "integer", "description": "Maximum results", "default": 10}
+            },
+            "required": ["query"]
+        },
+        handler=example_tool_handler
+    )
+    server.add_tool(tool)
+
+    print("MCP Framework loaded successfully!")
+    print(f"Server: {server.name} v{server.version}")
+    print(f"Tools: {list(server.tools.keys())}")
\ No newline at end of file
@@ -4,23 +4,22 @@ Advanced MCP host with improved NLP, context management, and UI abstraction
 """
 
 import asyncio
-import json
+import heapq
 import logging
-import os
 import re
+import signal
 import time
-from dataclasses import dataclass, asdict
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Set, Tuple
+from typing import Dict, List, Optional, Any, Tuple
 import aiohttp
-import websockets
 from pathlib import Path
 
 # Import our MCP framework
-from mcp_framework import (
-    MCPServer, MCPClient, MCPMessage, MCPTransport, 
-    WebSocketTransport, HTTPTransport, Tool, create_tool
-)
+from mcp_framework import MCPServer, MCPClient, create_tool, encode_json, decode_json
 
 # Logging setup
 logging.basicConfig(
@@ -29,6 +28,62 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Service handling each routable intent
+INTENT_SERVICES = {
+    "play_music": "ai-audio-assistant",
+    "control_volume": "ai-audio-assistant",
+    "switch_audio": "ai-audio-assistant",
+    "system_control": "ai-platform-linux",
+    "file_operation": "webgrab-server",
+    "hardware_control": "hardware-bridge",
+    "smart_home": "ai-home-automation",
+    "communication": "ai-communications",
+    "navigation": "ai-maps-navigation"
+}
+
+VOLUME_NUMBER_PATTERN = re.compile(r'\b(\d+)\b')
+VOLUME_PERCENT_PATTERN = re.compile(r'(\d+)%')
+ARTIST_PATTERN = re.compile(r"by\s+([^,\n]+)")
+TEMPERATURE_PATTERN = re.compile(r'(\d+)\s*degrees?|(\d+)°')
+DESTINATION_PATTERN = re.compile(r'to\s+([^,\n]+)')
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+PATH_PATTERN = re.compile(r'[/\\][\w\s/\\.-]+')
+# File actions in priority order; anchored at a word start so inflections
+# ("downloading", "saved") match but "recreate" does not read as create
+FILE_ACTION_PATTERNS = tuple(
+    (action, re.compile(r'\b' + action))
+    for action in ("download", "upload", "copy", "move", "delete", "create", "save")
+)
+# Word tokens without surrounding punctuation ("high." -> "high")
+WORD_PATTERN = re.compile(r'\w+')
+HARDWARE_PIN_PATTERN = re.compile(r'pin\s*(\d+)|gpio\s*(\d+)')
+HARDWARE_VALUE_PATTERN = re.compile(r'to\s+(\d+)|value\s+(\d+)|(\d+)%')
+
+# Context field types that must be copied before handing a snapshot off
+CONTEXT_FIELD_COPIERS = {list: list.copy, dict: dict.copy}
+
+
+def read_json_file(path: Path) -> Any:
+    """Read a JSON document from disk"""
+    return decode_json(path.read_bytes())
+
+
+def write_json_file(path: Path, payload: Any):
+    """Write an indented JSON document to disk"""
+    path.write_bytes(encode_json(payload, indent=True))
+
+
+def copy_context_fields(context: Any) -> Dict[str, Any]:
+    """Copy a context's fields, detaching list and dict values from the live object"""
+    copiers = CONTEXT_FIELD_COPIERS
+    data = {}
+    for key, value in vars(context).items():
+        copy = copiers.get(type(value))
+        data[key] = value if copy is None else copy(value)
+    return data
+
 
 @dataclass
 class ServiceInfo:
@@ -94,12 +149,12 @@ class SessionContext:
         if self.service_state is None:
             self.service_state = {}
 
-    def is_active(self) -> bool:
+    def is_active(self, now: Optional[datetime] = None) -> bool:
         """Check if session is still active (within 30 minutes)"""
-        return datetime.now() - self.last_accessed < timedelta(minutes=30)
+        return (now or datetime.now()) - self.last_accessed < timedelta(minutes=30)
 
 
-@dataclass
+@dataclass(slots=True)
 class IntentResult:
     """Result of intent classification"""
     intent: str
@@ -117,10 +172,86 @@ class IntentResult:
 class EnhancedNLPProcessor:
     """Advanced NLP processor with context awareness and learning"""
     
+    # Parameter extraction vocabularies; (label, keywords) rows are matched
+    # as substrings in priority order
+    MUSIC_GENRES = (
+        "jazz", "rock", "classical", "pop", "electronic",
+        "ambient", "folk", "metal", "blues", "country"
+    )
+    MUSIC_PLATFORMS = ("spotify", "youtube", "soundcloud", "apple music")
+    MUSIC_MOODS = (
+        ("relaxing", ("relaxing", "calm", "peaceful", "chill")),
+        ("energetic", ("energetic", "upbeat", "fast", "dance")),
+        ("sad", ("sad", "melancholy", "depressing")),
+        ("happy", ("happy", "cheerful", "uplifting"))
+    )
+    MUSIC_FILLER_WORDS = frozenset(("play", "music", "song", "some"))
+    VOLUME_ACTIONS = (
+        ("up", ("up", "higher", "louder", "increase")),
+        ("down", ("down", "lower", "quieter", "decrease")),
+        ("mute", ("mute", "silent", "off")),
+        ("unmute", ("unmute", "on")),
+        ("max", ("max", "maximum", "full")),
+        ("min", ("min", "minimum"))
+    )
+    AUDIO_DEVICES = (
+        ("headphones", ("headphones", "headset", "earbuds")),
+        ("speakers", ("speakers", "speaker")),
+        ("bluetooth", ("bluetooth", "bt")),
+        ("rtsp", ("rtsp", "network", "streaming")),
+        ("hdmi", ("hdmi", "tv", "television")),
+        ("usb", ("usb",))
+    )
+    SYSTEM_ACTIONS = frozenset((
+        "open", "close", "launch", "run",
+        "execute", "kill", "start", "stop"
+    ))
+    # Hardware actions are matched against whole words so that e.g. "on"
+    # does not fire inside "button"
+    HARDWARE_ACTIONS = (
+        ("on", frozenset(("on", "high", "enable", "activate"))),
+        ("off", frozenset(("off", "low", "disable", "deactivate"))),
+        ("toggle", frozenset(("toggle", "switch"))),
+        ("read", frozenset(("read", "get", "check"))),
+        ("write", frozenset(("write", "set")))
+    )
+    HOME_DEVICES = (
+        ("lights", ("lights", "light", "lamp", "bulb")),
+        ("temperature", ("temperature", "thermostat", "heating", "cooling")),
+        ("security", ("lock", "unlock", "alarm", "camera", "door")),
+        ("blinds", ("blinds", "curtains", "shades"))
+    )
+    HOME_ACTIONS = (
+        ("on", ("on", "turn on", "enable")),
+        ("off", ("off", "turn off", "disable")),
+        ("dim", ("dim", "dimmer")),
+        ("brighten", ("brighten", "brighter")),
+        ("lock", ("lock",)),
+        ("unlock", ("unlock",))
+    )
+    HOME_ROOMS = ("living room", "bedroom", "kitchen", "bathroom", "office", "garage")
+    TRAVEL_MODES = (
+        ("driving", ("drive", "driving", "car")),
+        ("walking", ("walk", "walking", "foot")),
+        ("transit", ("transit", "bus", "train", "public")),
+        ("cycling", ("bike", "cycling", "bicycle"))
+    )
+    
     def __init__(self):
         self.intent_patterns = self._initialize_patterns()
+        self.keyword_intents = self._index_keywords(self.intent_patterns)
+        # (intent, keyword set, weight) rows read by the scoring pass
+        self.intent_rows = tuple(
+            (intent, frozenset(config.get("keywords", [])), config.get("weight", 1.0))
+            for intent, config in self.intent_patterns.items()
+        )
+        # Context-free scores per token sequence; repeated commands skip scoring
+        self._score_tokens = lru_cache(maxsize=1024)(self._score_tokens_uncached)
         self.context_patterns = self._initialize_context_patterns()
         self.parameter_extractors = self._initialize_extractors()
+        # Extracted parameters per (intent, text); extractors ignore context
+        self.parameter_cache: "OrderedDict[Tuple[str, str], Dict[str, str]]" = OrderedDict()
+        self.max_parameter_cache_size = 1024
         
     def _initialize_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Initialize intent patterns with weights and context"""
@@ -186,6 +317,24 @@ class EnhancedNLPProcessor:
             }
         }
     
+    @staticmethod
+    def _index_keywords(patterns: Dict[str, Dict[str, Any]]) -> Dict[str, Tuple[str, ...]]:
+        """Map each distinct keyword to the intents listing it"""
+        index: Dict[str, List[str]] = {}
+        for intent, config in patterns.items():
+            for keyword in config.get("keywords", []):
+                index.setdefault(keyword, []).append(intent)
+        return {keyword: tuple(intents) for keyword, intents in index.items()}
+    
+    def _count_keyword_hits(self, text: str) -> Dict[str, int]:
+        """Count keyword substring hits per intent in a single pass"""
+        hits: Dict[str, int] = {}
+        for keyword, intents in self.keyword_intents.items():
+            if keyword in text:
+                for intent in intents:
+                    hits[intent] = hits.get(intent, 0) + 1
+        return hits
+    
     def _initialize_context_patterns(self) -> Dict[str, List[str]]:
         """Initialize context-sensitive patterns"""
         return {
@@ -219,24 +368,28 @@ class EnhancedNLPProcessor:
         intent_scores = {}
         context_used = False
         
-        for intent, config in self.intent_patterns.items():
-            score = self._calculate_intent_score(text_lower, words, intent, config, context)
-            if score > 0:
-                intent_scores[intent] = score
-                
-                # Apply context boost if available
-                if context and "context_boost" in config:
-                    boost_score = self._apply_context_boost(config["context_boost"], context)
-                    if boost_score > 0:
-                        intent_scores[intent] += boost_score
-                        context_used = True
+        for intent, score in self._score_tokens(tuple(words)):
+            config = self.intent_patterns[intent]
+            
+            # Context requirement check
+            if config.get("requires_context", False) and not context:
+                continue
+            
+            intent_scores[intent] = score
+            
+            # Apply context boost if available
+            if context and "context_boost" in config:
+                boost_score = self._apply_context_boost(config["context_boost"], context)
+                if boost_score > 0:
+                    intent_scores[intent] += boost_score
+                    context_used = True
         
         if not intent_scores:
             return IntentResult("unknown", 0.0, {}, text)
         
-        # Sort by score and get alternatives
-        sorted_intents = sorted(intent_scores.items(), key=lambda x: x[1], reverse=True)
-        best_intent, best_score = sorted_intents[0]
+        # Select the best intent plus up to 3 alternatives without a full sort
+        top_intents = heapq.nlargest(4, intent_scores.items(), key=lambda x: x[1])
+        best_intent, best_score = top_intents[0]
         
         # Normalize confidence score
         confidence = min(best_score / len(words), 1.0)
@@ -244,10 +397,10 @@ class EnhancedNLPProcessor:
         # Extract parameters
         parameters = {}
         if best_intent in self.parameter_extractors:
-            parameters = await self.parameter_extractors[best_intent](text_lower, words, context)
+            parameters = self._extract_parameters(best_intent, text_lower, words, context)
         
         # Get alternatives (top 3)
-        alternatives = [(intent, score) for intent, score in sorted_intents[1:4]]
+        alternatives = top_intents[1:]
         
         return IntentResult(
             intent=best_intent,
@@ -258,25 +411,47 @@ class EnhancedNLPProcessor:
             alternatives=alternatives
         )
     
-    def _calculate_intent_score(self, text: str, words: List[str], intent: str, 
-                               config: Dict[str, Any], context: Optional[SessionContext]) -> float:
+    def _extract_parameters(self, intent: str, text: str, words: List[str],
+                            context: Optional[SessionContext]) -> Dict[str, str]:
+        """Extract parameters for an intent, reusing results for repeated text"""
+        cache_key = (intent, text)
+        cached = self.parameter_cache.get(cache_key)
+        if cached is not None:
+            self.parameter_cache.move_to_end(cache_key)
+        else:
+            cached = self.parameter_extractors[intent](text, words, context)
+            self.parameter_cache[cache_key] = cached
+            if len(self.parameter_cache) > self.max_parameter_cache_size:
+                self.parameter_cache.popitem(last=False)
+        # Callers add session fields to the returned dict, so hand out a copy
+        return dict(cached)
+    
+    def _score_tokens_uncached(self, words: Tuple[str, ...]) -> Tuple[Tuple[str, float], ...]:
+        """Score every intent against the command tokens, ignoring context"""
+        # Keywords never span whitespace, so matching against the re-joined
+        # tokens finds the same hits as the raw text
+        keyword_hits = self._count_keyword_hits(" ".join(words))
+        scores = []
+        for intent, keywords, weight in self.intent_rows:
+            keyword_score = keyword_hits.get(intent, 0)
+            # A leading word in the keyword set is also a substring hit, so
+            # intents without hits cannot score
+            if not keyword_score:
+                continue
+            score = self._calculate_intent_score(keyword_score, words, keywords, weight)
+            if score > 0:
+                scores.append((intent, score))
+        return tuple(scores)
+    
+    def _calculate_intent_score(self, keyword_score: int, words: List[str], 
+                               keywords: frozenset, weight: float) -> float:
         """Calculate intent score with various factors"""
-        keywords = config.get("keywords", [])
-        weight = config.get("weight", 1.0)
-        
-        # Basic keyword matching
-        keyword_score = sum(1 for keyword in keywords if keyword in text)
-        
         # Position weighting (earlier words get higher weight)
         position_score = 0
         for i, word in enumerate(words[:5]):  # Check first 5 words
             if word in keywords:
                 position_score += (5 - i) * 0.1
         
-        # Context requirement check
-        if config.get("requires_context", False) and not context:
-            return 0
-        
         return (keyword_score + position_score) * weight
     
     def _apply_context_boost(self, boost_config: Dict[str, Any], context: SessionContext) -> float:
@@ -294,116 +469,86 @@ class EnhancedNLPProcessor:
         
         return boost
     
-    async def _extract_music_params(self, text: str, words: List[str], 
-                                  context: Optional[SessionContext]) -> Dict[str, str]:
+    def _extract_music_params(self, text: str, words: List[str], 
+                            context: Optional[SessionContext]) -> Dict[str, str]:
         """Extract music-related parameters"""
         params = {}
         
         # Artist extraction
-        by_pattern = r"by\s+([^,\n]+)"
-        by_match = re.search(by_pattern, text)
+        by_match = ARTIST_PATTERN.search(text)
         if by_match:
             params["artist"] = by_match.group(1).strip()
         
         # Genre detection
-        genres = ["jazz", "rock", "classical", "pop", "electronic", "ambient", "folk", "metal", "blues", "country"]
-        for genre in genres:
+        for genre in self.MUSIC_GENRES:
             if genre in text:
                 params["genre"] = genre
                 break
         
         # Platform detection
-        platforms = ["spotify", "youtube", "soundcloud", "apple music"]
-        for platform in platforms:
+        for platform in self.MUSIC_PLATFORMS:
             if platform in text:
                 params["platform"] = platform
                 break
         
         # Mood/energy detection
-        moods = {
-            "relaxing": ["relaxing", "calm", "peaceful", "chill"],
-            "energetic": ["energetic", "upbeat", "fast", "dance"],
-            "sad": ["sad", "melancholy", "depressing"],
-            "happy": ["happy", "cheerful", "uplifting"]
-        }
-        
-        for mood, keywords in moods.items():
+        for mood, keywords in self.MUSIC_MOODS:
             if any(keyword in text for keyword in keywords):
                 params["mood"] = mood
                 break
         
         # Default query if no specific parameters
         if not params:
-            query_words = [w for w in words if w not in ["play", "music", "song", "some"]]
+            query_words = [w for w in words if w not in self.MUSIC_FILLER_WORDS]
             if query_words:
                 params["query"] = " ".join(query_words)
         
         return params
     
-    async def _extract_volume_params(self, text: str, words: List[str], 
-                                   context: Optional[SessionContext]) -> Dict[str, str]:
+    def _extract_volume_params(self, text: str, words: List[str], 
+                             context: Optional[SessionContext]) -> Dict[str, str]:
         """Extract volume control parameters"""
         params = {}
         
         # Volume actions
-        actions = {
-            "up": ["up", "higher", "louder", "increase"],
-            "down": ["down", "lower", "quieter", "decrease"],
-            "mute": ["mute", "silent", "off"],
-            "unmute": ["unmute", "on"],
-            "max": ["max", "maximum", "full"],
-            "min": ["min", "minimum"]
-        }
-        
-        for action, keywords in actions.items():
+        for action, keywords in self.VOLUME_ACTIONS:
             if any(keyword in text for keyword in keywords):
                 params["action"] = action
                 break
         
         # Numeric volume level
-        numbers = re.findall(r'\b(\d+)\b', text)
+        numbers = VOLUME_NUMBER_PATTERN.findall(text)
         if numbers:
             level = int(numbers[0])
             if 0 <= level <= 100:
                 params["level"] = str(level)
         
         # Percentage
-        percent_match = re.search(r'(\d+)%', text)
+        percent_match = VOLUME_PERCENT_PATTERN.search(text)
         if percent_match:
             params["level"] = percent_match.group(1)
         
         return params
     
-    async def _extract_audio_params(self, text: str, words: List[str], 
-                                  context: Optional[SessionContext]) -> Dict[str, str]:
+    def _extract_audio_params(self, text: str, words: List[str], 
+                            context: Optional[SessionContext]) -> Dict[str, str]:
         """Extract audio device parameters"""
         params = {}
         
-        devices = {
-            "headphones": ["headphones", "headset", "earbuds"],
-            "speakers": ["speakers", "speaker"],
-            "bluetooth": ["bluetooth", "bt"],
-            "rtsp": ["rtsp", "network", "streaming"],
-            "hdmi": ["hdmi", "tv", "television"],
-            "usb": ["usb"]
-        }
-        
-        for device, keywords in devices.items():
+        for device, keywords in self.AUDIO_DEVICES:
             if any(keyword in text for keyword in keywords):
                 params["device"] = device
                 break
         
         return params
     
-    async def _extract_system_params(self, text: str, words: List[str], 
-                                   context: Optional[SessionContext]) -> Dict[str, str]:
+    def _extract_system_params(self, text: str, words: List[str], 
+                             context: Optional[SessionContext]) -> Dict[str, str]:
         """Extract system control parameters"""
         params = {}
         
-        actions = ["open", "close", "launch", "run", "execute", "kill", "start", "stop"]
-        
         for i, word in enumerate(words):
-            if word in actions:
+            if word in self.SYSTEM_ACTIONS:
                 params["action"] = word
                 # Get target application/command
                 if i + 1 < len(words):
@@ -413,136 +558,101 @@ class EnhancedNLPProcessor:
         
         return params
     
-    async def _extract_hardware_params(self, text: str, words: List[str], 
-                                     context: Optional[SessionContext]) -> Dict[str, str]:
+    def _extract_hardware_params(self, text: str, words: List[str], 
+                               context: Optional[SessionContext]) -> Dict[str, str]:
         """Extract hardware control parameters"""
         params = {}
         
         # GPIO pin extraction
-        pin_pattern = r'pin\s*(\d+)|gpio\s*(\d+)'
-        pin_match = re.search(pin_pattern, text)
+        pin_match = HARDWARE_PIN_PATTERN.search(text)
         if pin_match:
-            pin_num = pin_match.group(1) or pin_match.group(2)
-            params["pin"] = pin_num
-        
-        # Actions
-        actions = {
-            "on": ["on", "high", "enable", "activate"],
-            "off": ["off", "low", "disable", "deactivate"],
-            "toggle": ["toggle", "switch"],
-            "read": ["read", "get", "check"],
-            "write": ["write", "set"]
-        }
+            params["pin"] = pin_match.group(1) or pin_match.group(2)
         
-        for action, keywords in actions.items():
-            if any(keyword in text for keyword in keywords):
+        # Actions; punctuation-free tokens so "high." still counts as "high"
+        tokens = WORD_PATTERN.findall(text)
+        for action, keywords in self.HARDWARE_ACTIONS:
+            if not keywords.isdisjoint(tokens):
                 params["action"] = action
                 break
         
         # Value for PWM/analog
-        value_pattern = r'to\s+(\d+)|value\s+(\d+)|(\d+)%'
-        value_match = re.search(value_pattern, text)
+        value_match = HARDWARE_VALUE_PATTERN.search(text)
         if value_match:
-            value = value_match.group(1) or value_match.group(2) or value_match.group(3)
-            params["value"] = value
+            params["value"] = (value_match.group(1) or value_match.group(2)
+                               or value_match.group(3))
         
         return params
     
-    async def _extract_home_params(self, text: str, words: List[str], 
-                                 context: Optional[SessionContext]) -> Dict[str, str]:
+    def _extract_home_params(self, text: str, words: List[str], 
+                           context: Optional[SessionContext]) -> Dict[str, str]:
         """Extract smart home parameters"""
         params = {}
         
         # Device types
-        devices = {
-            "lights": ["lights", "light", "lamp", "bulb"],
-            "temperature": ["temperature", "thermostat", "heating", "cooling"],
-            "security": ["lock", "unlock", "alarm", "camera", "door"],
-            "blinds": ["blinds", "curtains", "shades"]
-        }
-        
-        for device, keywords in devices.items():
+        for device, keywords in self.HOME_DEVICES:
             if any(keyword in text for keyword in keywords):
                 params["device_type"] = device
                 break
         
         # Actions
-        actions = {
-            "on": ["on", "turn on", "enable"],
-            "off": ["off", "turn off", "disable"],
-            "dim": ["dim", "dimmer"],
-            "brighten": ["brighten", "brighter"],
-            "lock": ["lock"],
-            "unlock": ["unlock"]
-        }
-        
-        for action, keywords in actions.items():
+        for action, keywords in self.HOME_ACTIONS:
             if any(keyword in text for keyword in keywords):
                 params["action"] = action
                 break
         
         # Room/location
-        rooms = ["living room", "bedroom", "kitchen", "bathroom", "office", "garage"]
-        for room in rooms:
+        for room in self.HOME_ROOMS:
             if room in text:
                 params["location"] = room
                 break
         
         # Temperature value
-        temp_pattern = r'(\d+)\s*degrees?|(\d+)°'
-        temp_match = re.search(temp_pattern, text)
+        temp_match = TEMPERATURE_PATTERN.search(text)
         if temp_match:
             temp = temp_match.group(1) or temp_match.group(2)
             params["temperature"] = temp
         
         return params
     
-    async def _extract_file_params(self, text: str, words: List[str], 
-                                 context: Optional[SessionContext]) -> Dict[str, str]:
+    def _extract_file_params(self, text: str, words: List[str], 
+                           context: Optional[SessionContext]) -> Dict[str, str]:
         """Extract file operation parameters"""
         params = {}
         
-        # URLs
-        url_pattern = r'https?://[^\s]+'
-        url_match = re.search(url_pattern, text)
-        if url_match:
-            params["url"] = url_match.group(0)
+        # URLs; most commands carry none, so only run the regex from the
+        # first literal "http" onwards
+        url_start = text.find("http")
+        if url_start != -1:
+            url_match = URL_PATTERN.search(text, url_start)
+            if url_match:
+                params["url"] = url_match.group(0)
         
-        # File paths
-        path_pattern = r'[/\\][\w\s/\\.-]+'
-        path_match = re.search(path_pattern, text)
-        if path_match:
-            params["path"] = path_match.group(0)
+        # File paths always start with a slash or backslash
+        if "/" in text or "\\" in text:
+            path_match = PATH_PATTERN.search(text)
+            if path_match:
+                params["path"] = path_match.group(0)
         
         # Actions
-        actions = ["download", "upload", "copy", "move", "delete", "create", "save"]
-        for action in actions:
-            if action in text:
+        for action, pattern in FILE_ACTION_PATTERNS:
+            if pattern.search(text):
                 params["action"] = action
                 break
         
         return params
     
-    async def _extract_navigation_params(self, text: str, words: List[str], 
-                                       context: Optional[SessionContext]) -> Dict[str, str]:
+    def _extract_navigation_params(self, text: str, words: List[str], 
+                                 context: Optional[SessionContext]) -> Dict[str, str]:
         """Extract navigation parameters"""
         params = {}
         
         # Destination extraction
-        to_pattern = r'to\s+([^,\n]+)'
-        to_match = re.search(to_pattern, text)
+        to_match = DESTINATION_PATTERN.search(text)
         if to_match:
             params["destination"] = to_match.group(1).strip()
         
         # Transportation mode
-        modes = {
-            "driving": ["drive", "driving", "car"],
-            "walking": ["walk", "walking", "foot"],
-            "transit": ["transit", "bus", "train", "public"],
-            "cycling": ["bike", "cycling", "bicycle"]
-        }
-        
-        for mode, keywords in modes.items():
+        for mode, keywords in self.TRAVEL_MODES:
             if any(keyword in text for keyword in keywords):
                 params["mode"] = mode
                 break
@@ -560,6 +670,10 @@ class ContextManager:
         self.users_cache: Dict[str, UserContext] = {}
         self.sessions_cache: Dict[str, SessionContext] = {}
         
+        # Pending background save; requests made while it runs are coalesced
+        self._save_task: Optional[asyncio.Task] = None
+        self._save_requested = False
+        
         # Load existing contexts
         self._load_contexts()
     
@@ -569,21 +683,19 @@ class ContextManager:
             # Load users
             users_file = self.data_dir / "users.json"
             if users_file.exists():
-                with open(users_file, 'r') as f:
-                    users_data = json.load(f)
-                    for user_id, data in users_data.items():
-                        data['last_activity'] = datetime.fromisoformat(data['last_activity'])
-                        self.users_cache[user_id] = UserContext(**data)
+                users_data = read_json_file(users_file)
+                for user_id, data in users_data.items():
+                    data['last_activity'] = datetime.fromisoformat(data['last_activity'])
+                    self.users_cache[user_id] = UserContext(**data)
             
             # Load sessions
             sessions_file = self.data_dir / "sessions.json"
             if sessions_file.exists():
-                with open(sessions_file, 'r') as f:
-                    sessions_data = json.load(f)
-                    for session_id, data in sessions_data.items():
-                        data['created_at'] = datetime.fromisoformat(data['created_at'])
-                        data['last_accessed'] = datetime.fromisoformat(data['last_accessed'])
-                        self.sessions_cache[session_id] = SessionContext(**data)
+                sessions_data = read_json_file(sessions_file)
+                for session_id, data in sessions_data.items():
+                    data['created_at'] = datetime.fromisoformat(data['created_at'])
+                    data['last_accessed'] = datetime.fromisoformat(data['last_accessed'])
+                    self.sessions_cache[session_id] = SessionContext(**data)
             
             logger.info(f"Loaded {len(self.users_cache)} users and {len(self.sessions_cache)} sessions")
             
@@ -591,50 +703,81 @@ class ContextManager:
             logger.error(f"Error loading contexts: {e}")
     
     def _save_contexts(self):
-        """Save contexts to disk"""
+        """Save contexts to disk, off the event loop when one is running"""
         try:
-            # Save users
-            users_data = {}
-            for user_id, context in self.users_cache.items():
-                data = asdict(context)
-                data['last_activity'] = data['last_activity'].isoformat()
-                users_data[user_id] = data
-            
-            with open(self.data_dir / "users.json", 'w') as f:
-                json.dump(users_data, f, indent=2)
-            
-            # Save sessions (only active ones)
-            sessions_data = {}
-            for session_id, context in self.sessions_cache.items():
-                if context.is_active():
-                    data = asdict(context)
-                    data['created_at'] = data['created_at'].isoformat()
-                    data['last_accessed'] = data['last_accessed'].isoformat()
-                    sessions_data[session_id] = data
-            
-            with open(self.data_dir / "sessions.json", 'w') as f:
-                json.dump(sessions_data, f, indent=2)
-                
-        except Exception as e:
-            logger.error(f"Error saving contexts: {e}")
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                self._write_contexts(self._snapshot_contexts())
+            except Exception as e:
+                logger.error(f"Error saving contexts: {e}")
+            return
+        
+        # Several updates per command collapse into a single write
+        self._save_requested = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = loop.create_task(self._flush_contexts())
+    
+    async def _flush_contexts(self):
+        """Write requested saves until no new request arrived meanwhile"""
+        while self._save_requested:
+            self._save_requested = False
+            try:
+                snapshot = self._snapshot_contexts()
+                await asyncio.to_thread(self._write_contexts, snapshot)
+            except Exception as e:
+                logger.error(f"Error saving contexts: {e}")
+    
+    async def wait_for_pending_save(self):
+        """Wait for an in-flight background save to finish"""
+        if self._save_task is not None:
+            await self._save_task
+    
+    def _snapshot_contexts(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Copy contexts into JSON-ready dicts that the writer thread can own"""
+        # Field values are strings or flat str lists/dicts, so copying one
+        # level deep is enough to detach the snapshot from live objects
+        users_data = {}
+        for user_id, context in self.users_cache.items():
+            data = copy_context_fields(context)
+            data['last_activity'] = context.last_activity.isoformat()
+            users_data[user_id] = data
+        
+        # Save sessions (only active ones)
+        now = datetime.now()
+        sessions_data = {}
+        for session_id, context in self.sessions_cache.items():
+            if context.is_active(now):
+                data = copy_context_fields(context)
+                data['created_at'] = context.created_at.isoformat()
+                data['last_accessed'] = context.last_accessed.isoformat()
+                sessions_data[session_id] = data
+        
+        return users_data, sessions_data
+    
+    def _write_contexts(self, snapshot: Tuple[Dict[str, Any], Dict[str, Any]]):
+        """Write a context snapshot to disk"""
+        users_data, sessions_data = snapshot
+        write_json_file(self.data_dir / "users.json", users_data)
+        write_json_file(self.data_dir / "sessions.json", sessions_data)
     
     def create_session(self, user_id: str, interface_type: str) -> str:
         """Create a new session"""
-        import uuid
         session_id = f"sess_{uuid.uuid4().hex[:16]}"
+        now = datetime.now()
         
         session = SessionContext(
             session_id=session_id,
             user_id=user_id,
             interface_type=interface_type,
-            created_at=datetime.now(),
-            last_accessed=datetime.now()
+            created_at=now,
+            last_accessed=now
         )
         
         self.sessions_cache[session_id] = session
         self._save_contexts()
         
-        logger.info(f"Created session {session_id} for user {user_id}")
+        logger.info("Created session %s for user %s", session_id, user_id)
         return session_id
     
     def get_session(self, session_id: str) -> Optional[SessionContext]:
@@ -672,7 +815,8 @@ class ContextManager:
     
     def cleanup_expired_sessions(self):
         """Remove expired sessions"""
-        expired = [sid for sid, session in self.sessions_cache.items() if not session.is_active()]
+        now = datetime.now()
+        expired = [sid for sid, session in self.sessions_cache.items() if not session.is_active(now)]
         for session_id in expired:
             del self.sessions_cache[session_id]
         
@@ -695,6 +839,35 @@ class EnhancedCoreOrchestrator(MCPServer):
         # Background tasks
         self._cleanup_task = None
         self._health_check_task = None
+        # Upper bound on concurrent health probes per sweep
+        self.health_check_concurrency = 8
+        
+        # Service call handlers resolved once, keyed by ServiceInfo.service_type
+        self._service_callers = {
+            "mcp": self._call_mcp_service,
+            "http": self._call_http_service,
+        }
+        
+        # Shared HTTP session for service calls, created on first use
+        self._http_session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, reusing pooled keep-alive connections"""
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=16,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
+            self._http_session = aiohttp.ClientSession(connector=connector)
+        return self._http_session
+    
+    async def close_http_session(self):
+        """Close the shared HTTP session"""
+        if self._http_session and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
     
     def setup_tools(self):
         """Setup enhanced orchestrator tools"""
@@ -791,7 +964,7 @@ class EnhancedCoreOrchestrator(MCPServer):
                                           interface_type: str = "voice",
                                           context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Handle enhanced voice command with context"""
-        logger.info(f"Processing enhanced command: {text}")
+        logger.info("Processing enhanced command: %s", text)
         
         try:
             # Create session if needed
@@ -806,7 +979,7 @@ class EnhancedCoreOrchestrator(MCPServer):
             # Parse command with context
             intent_result = await self.nlp_processor.parse_command(text, session_context)
             
-            logger.info(f"Intent: {intent_result.intent} (confidence: {intent_result.confidence:.2f})")
+            logger.info("Intent: %s (confidence: %.2f)", intent_result.intent, intent_result.confidence)
             
             # Route command
             response = await self._route_enhanced_command(intent_result, session_context, context)
@@ -841,11 +1014,12 @@ class EnhancedCoreOrchestrator(MCPServer):
     async def handle_create_session(self, user_id: str, interface_type: str) -> Dict[str, Any]:
         """Handle session creation"""
         session_id = self.context_manager.create_session(user_id, interface_type)
+        session = self.context_manager.sessions_cache[session_id]
         return {
             "session_id": session_id,
             "user_id": user_id,
             "interface_type": interface_type,
-            "created_at": datetime.now().isoformat()
+            "created_at": session.created_at.isoformat()
         }
     
     async def handle_service_analytics(self, service_name: Optional[str] = None, 
@@ -901,19 +1075,7 @@ class EnhancedCoreOrchestrator(MCPServer):
             return f"I'm not sure what you meant. Did you mean: {', '.join(alternatives)}? (confidence: {intent_result.confidence:.2f})"
         
         # Route to appropriate service
-        service_mapping = {
-            "play_music": "ai-audio-assistant",
-            "control_volume": "ai-audio-assistant", 
-            "switch_audio": "ai-audio-assistant",
-            "system_control": "ai-platform-linux",
-            "file_operation": "webgrab-server",
-            "hardware_control": "hardware-bridge",
-            "smart_home": "ai-home-automation",
-            "communication": "ai-communications",
-            "navigation": "ai-maps-navigation"
-        }
-        
-        service_name = service_mapping.get(intent)
+        service_name = INTENT_SERVICES.get(intent)
         if not service_name:
             return f"No service available for intent: {intent}"
         
@@ -950,7 +1112,7 @@ class EnhancedCoreOrchestrator(MCPServer):
             return f"Service {service_name} not available"
         
         service = self.services[service_name]
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Add session context to parameters if available
@@ -959,16 +1121,14 @@ class EnhancedCoreOrchestrator(MCPServer):
                 parameters["user_id"] = session_context.user_id
             
             # Call service based on type
-            if service.service_type == "mcp":
-                result = await self._call_mcp_service(service_name, tool_name, parameters)
-            elif service.service_type == "http":
-                result = await self._call_http_service(service, tool_name, parameters)
+            caller = self._service_callers.get(service.service_type)
+            if caller:
+                result = await caller(service, tool_name, parameters)
             else:
                 result = f"Unsupported service type: {service.service_type}"
             
             # Update service metrics
-            response_time = time.time() - start_time
-            service.response_time = response_time
+            service.response_time = time.perf_counter() - start_time
             service.health_status = "healthy"
             service.last_seen = datetime.now()
             
@@ -989,28 +1149,33 @@ class EnhancedCoreOrchestrator(MCPServer):
             logger.error(f"Error calling service {service_name}: {e}")
             return f"Error calling service {service_name}: {str(e)}"
     
-    async def _call_mcp_service(self, service_name: str, tool_name: str, 
+    async def _call_mcp_service(self, service: ServiceInfo, tool_name: str, 
                               parameters: Dict[str, str]) -> str:
         """Call MCP service"""
-        client = self.mcp_clients.get(service_name)
+        client = self.mcp_clients.get(service.name)
         if not client:
-            return f"MCP client not available for {service_name}"
+            return f"MCP client not available for {service.name}"
         
         result = await client.call_tool(tool_name, parameters)
-        return f"Service {service_name} responded: {result}"
+        return f"Service {service.name} responded: {result}"
     
     async def _call_http_service(self, service: ServiceInfo, tool_name: str,
                                parameters: Dict[str, str]) -> str:
         """Call HTTP service"""
         url = f"http://{service.host}:{service.port}/api/{tool_name}"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=parameters) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    return result.get("message", "HTTP service completed")
-                else:
-                    return f"HTTP error: {response.status}"
+        session = self._get_http_session()
+        async with session.post(url, data=encode_json(parameters),
+                                headers=JSON_HEADERS) as response:
+            if response.status // 100 != 2:
+                return f"HTTP error: {response.status}"
+            
+            # 201/202/204 replies may carry no body at all
+            body = await response.read()
+            if not body:
+                return "HTTP service completed"
+            result = decode_json(body)
+            return result.get("message", "HTTP service completed")
     
     async def start_background_tasks(self):
         """Start background maintenance tasks"""
@@ -1020,10 +1185,12 @@ class EnhancedCoreOrchestrator(MCPServer):
     
     async def stop_background_tasks(self):
         """Stop background tasks"""
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-        if self._health_check_task:
-            self._health_check_task.cancel()
+        tasks = [task for task in (self._cleanup_task, self._health_check_task) if task]
+        for task in tasks:
+            task.cancel()
+        # Let cancelled loops unwind before the HTTP session is closed
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.context_manager.wait_for_pending_save()
         logger.info("Background tasks stopped")
     
     async def _periodic_cleanup(self):
@@ -1050,25 +1217,37 @@ class EnhancedCoreOrchestrator(MCPServer):
     
     async def _check_all_services_health(self):
         """Check health of all registered services"""
-        for service_name, service in self.services.items():
+        # One wall-clock stamp per sweep is precise enough for last_seen
+        now = datetime.now()
+        # Probe concurrently so one slow service doesn't delay the rest
+        semaphore = asyncio.Semaphore(self.health_check_concurrency)
+        await asyncio.gather(*(
+            self._check_service_health(service_name, service, now, semaphore)
+            for service_name, service in list(self.services.items())
+        ))
+    
+    async def _check_service_health(self, service_name: str, service: ServiceInfo,
+                                    now: datetime, semaphore: asyncio.Semaphore):
+        """Check health of a single service"""
+        async with semaphore:
             try:
                 # Simple ping check
-                start_time = time.time()
+                start_time = time.perf_counter()
                 
                 if service.service_type == "http":
                     url = f"http://{service.host}:{service.port}/health"
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                            if response.status == 200:
-                                service.health_status = "healthy"
-                            else:
-                                service.health_status = "unhealthy"
+                    session = self._get_http_session()
+                    async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                        if response.status // 100 == 2:
+                            service.health_status = "healthy"
+                        else:
+                            service.health_status = "unhealthy"
                 else:
                     # For MCP services, we'd ping them differently
                     service.health_status = "unknown"
                 
-                service.response_time = time.time() - start_time
-                service.last_seen = datetime.now()
+                service.response_time = time.perf_counter() - start_time
+                service.last_seen = now
                 
             except Exception as e:
                 service.health_status = "error"
@@ -1160,13 +1339,22 @@ async def main():
     
     logger.info("Enhanced Core Orchestrator started on port 8080")
     
+    # Block until SIGINT/SIGTERM instead of waking up every second to poll
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Signal handlers are not supported by Windows event loops
+            pass
+    
     try:
-        while True:
-            await asyncio.sleep(1)
-    except KeyboardInterrupt:
+        await stop_event.wait()
         logger.info("Shutting down Enhanced Core Orchestrator")
     finally:
         await orchestrator.stop_background_tasks()
+        await orchestrator.close_http_session()
         await runner.cleanup()
 
 
@@ -7,6 +7,7 @@ import asyncio
 import logging
 import os
 import json
+import signal
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import aiohttp
@@ -27,6 +28,25 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Intent -> (service name, tool name). System commands go to the platform
+# controller for the OS we're running on (simple platform detection).
+INTENT_ROUTES = {
+    "play_music": ("ai-audio-assistant", "play_music"),
+    "control_volume": ("ai-audio-assistant", "set_volume"),
+    "switch_audio": ("ai-audio-assistant", "switch_audio_output"),
+    "system_control": (f"ai-platform-{os.name}", "execute_command"),
+    "smart_home": ("ai-home-automation", "control_device"),
+    "communication": ("ai-communications", "send_message"),
+    "navigation": ("ai-maps-navigation", "get_directions"),
+}
+
+# Parameter extraction vocabularies; tuples are scanned in priority order
+MUSIC_GENRES = ("jazz", "rock", "classical", "pop", "electronic", "ambient", "folk")
+MUSIC_FILLER_WORDS = frozenset(("play", "music", "song"))
+VOLUME_ACTIONS = ("up", "down", "high", "low", "max", "min")
+AUDIO_DEVICES = ("headphones", "speakers", "bluetooth", "rtsp")
+SYSTEM_ACTION_WORDS = frozenset(("open", "close", "launch", "run", "execute", "kill"))
+
 
 @dataclass
 class ServiceInfo:
@@ -52,6 +72,13 @@ class NLPProcessor:
             "communication": ["send", "call", "message", "text", "email", "whatsapp"],
             "navigation": ["directions", "navigate", "route", "map", "location", "traffic"]
         }
+        self.parameter_extractors = {
+            "play_music": self._extract_music_params,
+            "control_volume": self._extract_volume_params,
+            "switch_audio": self._extract_audio_params,
+            "system_control": self._extract_system_params,
+            "smart_home": self._extract_home_params
+        }
     
     async def parse_command(self, text: str) -> Dict[str, Any]:
         """Parse natural language command into intent and parameters"""
@@ -89,68 +116,90 @@ class NLPProcessor:
     
     def _extract_parameters(self, text: str, intent: str, words: List[str]) -> Dict[str, Any]:
         """Extract parameters from text based on intent"""
+        extractor = self.parameter_extractors.get(intent)
+        if extractor is None:
+            return {}
+        return extractor(text, words)
+    
+    def _extract_music_params(self, text: str, words: List[str]) -> Dict[str, Any]:
+        """Extract artist, genre or a free-text query"""
         params = {}
         
-        if intent == "play_music":
-            # Look for artist, song, genre patterns
-            if "artist" in text or "by" in text:
-                # Simple artist extraction
-                by_index = next((i for i, word in enumerate(words) if word == "by"), -1)
-                if by_index != -1 and by_index + 1 < len(words):
-                    params["artist"] = " ".join(words[by_index + 1:])
-            
-            # Genre detection
-            genres = ["jazz", "rock", "classical", "pop", "electronic", "ambient", "folk"]
-            for genre in genres:
-                if genre in text:
-                    params["genre"] = genre
-                    break
-            
-            # Default query
-            if not params:
-                params["query"] = " ".join([w for w in words if w not in ["play", "music", "song"]])
-        
-        elif intent == "control_volume":
-            # Volume level extraction
-            volume_words = ["up", "down", "high", "low", "max", "min"]
-            for word in volume_words:
-                if word in words:
-                    params["action"] = word
-                    break
-            
-            # Numeric volume
-            for word in words:
-                if word.isdigit():
-                    params["level"] = int(word)
-                    break
-        
-        elif intent == "switch_audio":
-            # Audio device detection
-            devices = ["headphones", "speakers", "bluetooth", "rtsp"]
-            for device in devices:
-                if device in text:
-                    params["device"] = device
-                    break
-        
-        elif intent == "system_control":
-            # Application name extraction
-            action_words = ["open", "close", "launch", "run", "execute", "kill"]
-            for i, word in enumerate(words):
-                if word in action_words and i + 1 < len(words):
-                    params["action"] = word
-                    params["target"] = " ".join(words[i + 1:])
-                    break
-        
-        elif intent == "smart_home":
-            # Device and action extraction
-            if "lights" in text:
-                params["device_type"] = "lights"
-                if "dim" in text or "brightness" in text:
-                    params["action"] = "dim"
-                elif "on" in text:
-                    params["action"] = "on"
-                elif "off" in text:
-                    params["action"] = "off"
+        # Look for artist, song, genre patterns
+        if "artist" in text or "by" in text:
+            # Simple artist extraction
+            by_index = next((i for i, word in enumerate(words) if word == "by"), -1)
+            if by_index != -1 and by_index + 1 < len(words):
+                params["artist"] = " ".join(words[by_index + 1:])
+        
+        # Genre detection
+        for genre in MUSIC_GENRES:
+            if genre in text:
+                params["genre"] = genre
+                break
+        
+        # Default query
+        if not params:
+            params["query"] = " ".join([w for w in words if w not in MUSIC_FILLER_WORDS])
+        
+        return params
+    
+    def _extract_volume_params(self, text: str, words: List[str]) -> Dict[str, Any]:
+        """Extract volume action and level"""
+        params = {}
+        
+        # Volume level extraction
+        for word in VOLUME_ACTIONS:
+            if word in words:
+                params["action"] = word
+                break
+        
+        # Numeric volume
+        for word in words:
+            if word.isdigit():
+                params["level"] = int(word)
+                break
+        
+        return params
+    
+    def _extract_audio_params(self, text: str, words: List[str]) -> Dict[str, Any]:
+        """Extract target audio device"""
+        params = {}
+        
+        # Audio device detection
+        for device in AUDIO_DEVICES:
+            if device in text:
+                params["device"] = device
+                break
+        
+        return params
+    
+    def _extract_system_params(self, text: str, words: List[str]) -> Dict[str, Any]:
+        """Extract system action and target"""
+        params = {}
+        
+        # Application name extraction
+        for i, word in enumerate(words):
+            if word in SYSTEM_ACTION_WORDS and i + 1 < len(words):
+                params["action"] = word
+                params["target"] = " ".join(words[i + 1:])
+                break
+        
+        return params
+    
+    def _extract_home_params(self, text: str, words: List[str]) -> Dict[str, Any]:
+        """Extract smart home device and action"""
+        params = {}
+        
+        # Device and action extraction
+        if "lights" in text:
+            params["device_type"] = "lights"
+            if "dim" in text or "brightness" in text:
+                params["action"] = "dim"
+            elif "on" in text:
+                params["action"] = "on"
+            elif "off" in text:
+                params["action"] = "off"
         
         return params
 
@@ -290,32 +339,12 @@ class CoreOrchestrator(MCPServer):
         intent = parsed_command["intent"]
         parameters = parsed_command["parameters"]
         
-        if intent == "play_music":
-            return await self._call_service("ai-audio-assistant", "play_music", parameters)
-        
-        elif intent == "control_volume":
-            return await self._call_service("ai-audio-assistant", "set_volume", parameters)
-        
-        elif intent == "switch_audio":
-            return await self._call_service("ai-audio-assistant", "switch_audio_output", parameters)
-        
-        elif intent == "system_control":
-            # Determine which platform controller to use
-            platform = os.name  # Simple platform detection
-            service_name = f"ai-platform-{platform}"
-            return await self._call_service(service_name, "execute_command", parameters)
-        
-        elif intent == "smart_home":
-            return await self._call_service("ai-home-automation", "control_device", parameters)
-        
-        elif intent == "communication":
-            return await self._call_service("ai-communications", "send_message", parameters)
-        
-        elif intent == "navigation":
-            return await self._call_service("ai-maps-navigation", "get_directions", parameters)
-        
-        else:
+        route = INTENT_ROUTES.get(intent)
+        if route is None:
             return f"Unknown intent: {intent}. Available intents: {list(self.nlp_processor.intent_patterns.keys())}"
+        
+        service_name, tool_name = route
+        return await self._call_service(service_name, tool_name, parameters)
     
     async def _call_service(self, service_name: str, tool_name: str, parameters: Dict[str, Any]) -> str:
         """Call a tool on a specific service"""
@@ -420,17 +449,27 @@ async def main():
     # Start HTTP server
     runner = await orchestrator.start_http_server()
     
+    # Wake on SIGINT/SIGTERM or every 30 seconds for health checks
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Signal handlers are not supported by Windows event loops
+            pass
+    
     try:
         # Keep running
         logger.info("Core Orchestrator is running. Press Ctrl+C to stop.")
-        while True:
-            await asyncio.sleep(1)
-            
+        while not stop_event.is_set():
             # Periodic health checks
             await orchestrator.handle_health_check()
-            await asyncio.sleep(30)  # Check every 30 seconds
-            
-    except KeyboardInterrupt:
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=30)  # Check every 30 seconds
+            except asyncio.TimeoutError:
+                pass
+        
         logger.info("Shutting down Core Orchestrator")
     finally:
         await runner.cleanup()
@@ -13,13 +13,57 @@ from typing import Any, Dict, List, Optional, Union, Callable, Awaitable
 from enum import Enum
 import websockets
 import aiohttp
-from pydantic import BaseModel, validator
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PROTOCOL_VERSION = "2024-11-05"
+
+# Static capability blocks sent during the initialize handshake; shared
+# across calls, so treat them as read-only
+SERVER_CAPABILITIES: Dict[str, Any] = {
+    "tools": {"listChanged": True},
+    "resources": {"subscribe": True, "listChanged": True},
+    "prompts": {"listChanged": True},
+    "logging": {}
+}
+CLIENT_CAPABILITIES: Dict[str, Any] = {
+    "tools": {},
+    "resources": {},
+    "prompts": {}
+}
+
+
+def encode_json(data: Any, default: Optional[Callable[[Any], Any]] = None,
+                indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed
+
+    default converts values the encoder does not know; indent pretty-prints
+    with two spaces.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=default, option=option)
+    text = json.dumps(data, default=default, indent=2 if indent else None)
+    return text.encode("utf-8")
+
+
+def decode_json(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class MessageType(str, Enum):
     """MCP message types"""
@@ -74,7 +118,7 @@ class MCPMessage:
 
     def to_json(self) -> str:
         """Convert message to JSON string"""
-        return json.dumps(self.to_dict())
+        return encode_json(self.to_dict()).decode("utf-8")
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MCPMessage':
@@ -89,9 +133,9 @@ class MCPMessage:
         )
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'MCPMessage':
+    def from_json(cls, json_str: Union[str, bytes]) -> 'MCPMessage':
         """Create message from JSON string"""
-        return cls.from_dict(json.loads(json_str))
+        return cls.from_dict(decode_json(json_str))
 
 
 @dataclass
@@ -213,8 +257,13 @@ class HTTPTransport(MCPTransport):
 
     async def send(self, message: MCPMessage) -> None:
         """Send message via HTTP POST"""
-        async with self.session.post(self.url, json=message.to_dict()) as response:
-            if response.status != 200:
+        async with self.session.post(
+            self.url,
+            data=encode_json(message.to_dict()),
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            # Any 2xx is a successful delivery (servers commonly answer 202/204)
+            if response.status // 100 != 2:
                 raise MCPError(-32603, f"HTTP error: {response.status}")
 
     async def receive(self) -> MCPMessage:
@@ -226,6 +275,10 @@ class HTTPTransport(MCPTransport):
         await self.session.close()
 
 
+# Coroutine that answers one MCP request
+MethodHandler = Callable[[MCPMessage], Awaitable[MCPMessage]]
+
+
 class MCPServer:
     """MCP Server implementation"""
 
@@ -238,48 +291,53 @@ class MCPServer:
         self.transport: Optional[MCPTransport] = None
         self.initialized = False
         self.running = False
+        # Serialized */list payloads, rebuilt only after a registration
+        self._tools_list: Optional[List[Dict[str, Any]]] = None
+        self._resources_list: Optional[List[Dict[str, Any]]] = None
+        self._prompts_list: Optional[List[Dict[str, Any]]] = None
+        # Method name -> handler, keyed by the plain string value of MessageType
+        self._method_handlers: Dict[str, MethodHandler] = {
+            MessageType.INITIALIZE.value: self._handle_initialize,
+            MessageType.TOOLS_LIST.value: self._handle_tools_list,
+            MessageType.TOOLS_CALL.value: self._handle_tools_call,
+            MessageType.RESOURCES_LIST.value: self._handle_resources_list,
+            MessageType.RESOURCES_READ.value: self._handle_resources_read,
+            MessageType.PROMPTS_LIST.value: self._handle_prompts_list,
+            MessageType.PROMPTS_GET.value: self._handle_prompts_get,
+            MessageType.PING.value: self._handle_ping,
+            MessageType.SHUTDOWN.value: self._handle_shutdown,
+        }
 
     def add_tool(self, tool: Tool) -> None:
         """Add a tool to the server"""
         self.tools[tool.name] = tool
+        self._tools_list = None
         logger.info(f"Added tool: {tool.name}")
 
     def add_resource(self, resource: Resource) -> None:
         """Add a resource to the server"""
         self.resources[resource.uri] = resource
+        self._resources_list = None
         logger.info(f"Added resource: {resource.uri}")
 
     def add_prompt(self, prompt: Prompt) -> None:
         """Add a prompt to the server"""
         self.prompts[prompt.name] = prompt
+        self._prompts_list = None
         logger.info(f"Added prompt: {prompt.name}")
 
     async def handle_message(self, message: MCPMessage) -> Optional[MCPMessage]:
         """Handle incoming MCP message"""
         try:
-            if message.method == MessageType.INITIALIZE:
-                return await self._handle_initialize(message)
-            elif message.method == MessageType.TOOLS_LIST:
-                return await self._handle_tools_list(message)
-            elif message.method == MessageType.TOOLS_CALL:
-                return await self._handle_tools_call(message)
-            elif message.method == MessageType.RESOURCES_LIST:
-                return await self._handle_resources_list(message)
-            elif message.method == MessageType.RESOURCES_READ:
-                return await self._handle_resources_read(message)
-            elif message.method == MessageType.PROMPTS_LIST:
-                return await self._handle_prompts_list(message)
-            elif message.method == MessageType.PROMPTS_GET:
-                return await self._handle_prompts_get(message)
-            elif message.method == MessageType.PING:
-                return await self._handle_ping(message)
-            elif message.method == MessageType.SHUTDOWN:
-                return await self._handle_shutdown(message)
-            else:
+            # Messages built in-process may carry the MessageType member itself
+            method = getattr(message.method, "value", message.method)
+            handler = self._method_handlers.get(method)
+            if handler is None:
                 return MCPMessage(
                     id=message.id,
                     error=MCPError(-32601, f"Method not found: {message.method}").to_dict()
                 )
+            return await handler(message)
         except Exception as e:
             logger.error(f"Error handling message: {e}")
             return MCPMessage(
@@ -293,13 +351,8 @@ class MCPServer:
         return MCPMessage(
             id=message.id,
             result={
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {"listChanged": True},
-                    "resources": {"subscribe": True, "listChanged": True},
-                    "prompts": {"listChanged": True},
-                    "logging": {}
-                },
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": SERVER_CAPABILITIES,
                 "serverInfo": {
                     "name": self.name,
                     "version": self.version
@@ -309,10 +362,11 @@ class MCPServer:
 
     async def _handle_tools_list(self, message: MCPMessage) -> MCPMessage:
         """Handle tools/list request"""
-        tools_list = [tool.to_dict() for tool in self.tools.values()]
+        if self._tools_list is None:
+            self._tools_list = [tool.to_dict() for tool in self.tools.values()]
         return MCPMessage(
             id=message.id,
-            result={"tools": tools_list}
+            result={"tools": self._tools_list}
         )
 
     async def _handle_tools_call(self, message: MCPMessage) -> MCPMessage:
@@ -365,10 +419,13 @@ class MCPServer:
 
     async def _handle_resources_list(self, message: MCPMessage) -> MCPMessage:
         """Handle resources/list request"""
-        resources_list = [resource.to_dict() for resource in self.resources.values()]
+        if self._resources_list is None:
+            self._resources_list = [
+                resource.to_dict() for resource in self.resources.values()
+            ]
         return MCPMessage(
             id=message.id,
-            result={"resources": resources_list}
+            result={"resources": self._resources_list}
         )
 
     async def _handle_resources_read(self, message: MCPMessage) -> MCPMessage:
@@ -402,10 +459,13 @@ class MCPServer:
 
     async def _handle_prompts_list(self, message: MCPMessage) -> MCPMessage:
         """Handle prompts/list request"""
-        prompts_list = [prompt.to_dict() for prompt in self.prompts.values()]
+        if self._prompts_list is None:
+            self._prompts_list = [
+                prompt.to_dict() for prompt in self.prompts.values()
+            ]
         return MCPMessage(
             id=message.id,
-            result={"prompts": prompts_list}
+            result={"prompts": self._prompts_list}
         )
 
     async def _handle_prompts_get(self, message: MCPMessage) -> MCPMessage:
@@ -505,12 +565,8 @@ class MCPClient:
             id=self._next_id(),
             method=MessageType.INITIALIZE,
             params={
-                "protocolVersion": "2024-11-05",
-                "capabilities": {
-                    "tools": {},
-                    "resources": {},
-                    "prompts": {}
-                },
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": CLIENT_CAPABILITIES,
                 "clientInfo": {
                     "name": "ai-servis-client",
                     "version": "1.0.0"
@@ -71,7 +71,7 @@ class HardwareClient:
         try:
             # Send command as JSON
             message = json.dumps(command) + "\n"
-            self.socket.send(message.encode('utf-8'))
+            self.socket.sendall(message.encode('utf-8'))
 
             # Receive response
             response_data = self.socket.recv(4096)
@@ -124,7 +124,7 @@ class MCPClient:
         try:
             # Send request as JSON
             message = json.dumps(request) + "\n"
-            self.socket.send(message.encode('utf-8'))
+            self.socket.sendall(message.encode('utf-8'))
 
             # Receive response
             response_data = self.socket.recv(4096)
@@ -143,20 +143,22 @@ class MCPClient:
         """Get list of available MCP tools"""
         return list(self.tools.values())
 
+    @staticmethod
+    def _tool_call_request(request_id: int, tool_name: str,
+                           arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a JSON-RPC tools/call request"""
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {"name": tool_name, "arguments": arguments}
+        }
+
     def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> MCPResult:
         """Execute MCP tool"""
         try:
             if tool_name == "download_file":
-                request = {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "download_file",
-                        "arguments": arguments
-                    }
-                }
-
+                request = self._tool_call_request(1, tool_name, arguments)
                 response = self._send_request(request)
                 if response and "result" in response:
                     return MCPResult(
@@ -175,16 +177,7 @@ class MCPClient:
                     )
 
             elif tool_name == "abort_download":
-                request = {
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "abort_download",
-                        "arguments": arguments
-                    }
-                }
-
+                request = self._tool_call_request(2, tool_name, arguments)
                 response = self._send_request(request)
                 if response and "result" in response:
                     return MCPResult(
@@ -203,16 +196,7 @@ class MCPClient:
                     )
 
             elif tool_name == "get_download_status":
-                request = {
-                    "jsonrpc": "2.0",
-                    "id": 3,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "get_download_status",
-                        "arguments": arguments
-                    }
-                }
-
+                request = self._tool_call_request(3, tool_name, arguments)
                 response = self._send_request(request)
                 if response and "result" in response:
                     status = response["result"]
@@ -232,16 +216,7 @@ class MCPClient:
                     )
 
             elif tool_name == "gpio_task":
-                request = {
-                    "jsonrpc": "2.0",
-                    "id": 4,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "gpio_task",
-                        "arguments": arguments
-                    }
-                }
-
+                request = self._tool_call_request(4, tool_name, arguments)
                 response = self._send_request(request)
                 if response and "result" in response:
                     result = response["result"]
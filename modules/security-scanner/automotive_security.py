@@ -11,11 +11,13 @@ import asyncio
 import json
 import logging
 import hashlib
+import re
 import subprocess
 import time
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, NamedTuple, Optional, Any, Pattern, Tuple, Union
 from pathlib import Path
 import aiohttp
 import docker
@@ -49,6 +51,54 @@ class AutomotiveSecurityStandard(Enum):
     SAE_J3061 = "sae_j3061"           # Cybersecurity guidebook
 
 
+class CodePattern(NamedTuple):
+    """Insecure source code pattern with its precompiled regex and finding id"""
+    id: str
+    title: str
+    severity: SecurityThreatLevel
+    impact: str
+    regex: Pattern[str]
+
+
+def _code_pattern(pattern: str, title: str, severity: SecurityThreatLevel,
+                  impact: str) -> CodePattern:
+    """Compile a code pattern and derive its stable finding id"""
+    digest = hashlib.md5(pattern.encode()).hexdigest()[:8]
+    return CodePattern(
+        id=f"automotive_pattern_{digest}",
+        title=title,
+        severity=severity,
+        impact=impact,
+        regex=re.compile(pattern)
+    )
+
+
+# Automotive-specific insecure code patterns, compiled once at import
+AUTOMOTIVE_CODE_PATTERNS: Tuple[CodePattern, ...] = (
+    _code_pattern(
+        r"time\.sleep\(\s*[0-9]+\s*\)",
+        "Blocking sleep in automotive code",
+        SecurityThreatLevel.MEDIUM,
+        "Blocking operations can affect real-time automotive responses"
+    ),
+    _code_pattern(
+        r"subprocess\.call\(",
+        "Unsafe subprocess call",
+        SecurityThreatLevel.HIGH,
+        "Unsafe subprocess execution in automotive system"
+    ),
+    _code_pattern(
+        r"eval\(",
+        "Dynamic code execution",
+        SecurityThreatLevel.CRITICAL,
+        "Code injection vulnerability in automotive system"
+    ),
+)
+
+# Vulnerability descriptions that point at credential handling
+SECRET_MENTION_PATTERN = re.compile(r"password|secret", re.IGNORECASE)
+
+
 @dataclass
 class SecurityVulnerability:
     """Security vulnerability information"""
@@ -90,6 +140,8 @@ class AutomotiveSecurityScanner:
         self.docker_client = docker.from_env()
         self.scan_results: List[SecurityScanResult] = []
         self.active_threats: List[SecurityVulnerability] = []
+        # Running vulnerability count per severity, updated as scans complete
+        self.severity_counts: Counter = Counter()
         
         # Automotive-specific configuration
         self.iso_26262_enabled = config.get("iso_26262_compliance", True)
@@ -105,6 +157,11 @@ class AutomotiveSecurityScanner:
             "owasp_zap": {"enabled": False, "timeout": 1800}  # Disabled by default for performance
         }
 
+    def _record_scan_result(self, result: SecurityScanResult) -> None:
+        """Store a finished scan and fold its findings into the running counts"""
+        self.scan_results.append(result)
+        self.severity_counts.update(vuln.severity for vuln in result.vulnerabilities)
+
     async def scan_container_image(self, image_name: str) -> SecurityScanResult:
         """Scan container image for automotive-specific vulnerabilities"""
         scan_id = f"container_{int(time.time())}"
@@ -145,7 +202,7 @@ class AutomotiveSecurityScanner:
             result.end_time = datetime.now()
             logger.error(f"❌ Container scan failed: {e}")
         
-        self.scan_results.append(result)
+        self._record_scan_result(result)
         return result
 
     async def scan_source_code(self, source_path: Path) -> SecurityScanResult:
@@ -192,7 +249,7 @@ class AutomotiveSecurityScanner:
             result.end_time = datetime.now()
             logger.error(f"❌ Source code scan failed: {e}")
         
-        self.scan_results.append(result)
+        self._record_scan_result(result)
         return result
 
     async def scan_network_services(self, target_host: str = "localhost") -> SecurityScanResult:
@@ -236,7 +293,7 @@ class AutomotiveSecurityScanner:
             result.end_time = datetime.now()
             logger.error(f"❌ Network scan failed: {e}")
         
-        self.scan_results.append(result)
+        self._record_scan_result(result)
         return result
 
     async def _run_trivy_scan(self, image_name: str) -> List[SecurityVulnerability]:
@@ -446,43 +503,20 @@ class AutomotiveSecurityScanner:
         vulnerabilities = []
         
         try:
-            # Search for automotive-specific security anti-patterns
-            automotive_patterns = [
-                {
-                    "pattern": r"time\.sleep\(\s*[0-9]+\s*\)",
-                    "title": "Blocking sleep in automotive code",
-                    "severity": SecurityThreatLevel.MEDIUM,
-                    "impact": "Blocking operations can affect real-time automotive responses"
-                },
-                {
-                    "pattern": r"subprocess\.call\(",
-                    "title": "Unsafe subprocess call",
-                    "severity": SecurityThreatLevel.HIGH,
-                    "impact": "Unsafe subprocess execution in automotive system"
-                },
-                {
-                    "pattern": r"eval\(",
-                    "title": "Dynamic code execution",
-                    "severity": SecurityThreatLevel.CRITICAL,
-                    "impact": "Code injection vulnerability in automotive system"
-                }
-            ]
-            
             for py_file in source_path.rglob("*.py"):
                 try:
                     with open(py_file, 'r', encoding='utf-8') as f:
                         content = f.read()
                         
-                    for pattern_info in automotive_patterns:
-                        import re
-                        if re.search(pattern_info["pattern"], content):
+                    for code_pattern in AUTOMOTIVE_CODE_PATTERNS:
+                        if code_pattern.regex.search(content):
                             vulnerabilities.append(SecurityVulnerability(
-                                id=f"automotive_pattern_{hashlib.md5(pattern_info['pattern'].encode()).hexdigest()[:8]}",
-                                title=pattern_info["title"],
+                                id=code_pattern.id,
+                                title=code_pattern.title,
                                 description=f"Found in {py_file}",
-                                severity=pattern_info["severity"],
+                                severity=code_pattern.severity,
                                 component=str(py_file),
-                                automotive_impact=pattern_info["impact"],
+                                automotive_impact=code_pattern.impact,
                                 compliance_standards=[AutomotiveSecurityStandard.ISO_26262]
                             ))
                             
@@ -720,7 +754,7 @@ class AutomotiveSecurityScanner:
         if any("ssl" in v.id for v in vulnerabilities):
             recommendations.append("🔒 Update SSL/TLS configuration and certificates for secure automotive communications")
         
-        if any("password" in v.description.lower() or "secret" in v.description.lower() for v in vulnerabilities):
+        if any(SECRET_MENTION_PATTERN.search(v.description) for v in vulnerabilities):
             recommendations.append("🔐 Implement proper secrets management for automotive credentials")
         
         if any(AutomotiveSecurityStandard.ISO_26262 in v.compliance_standards for v in vulnerabilities):
@@ -737,9 +771,9 @@ class AutomotiveSecurityScanner:
     async def generate_security_report(self, output_path: Path = Path("automotive_security_report.json")) -> Dict[str, Any]:
         """Generate comprehensive security report"""
         
-        total_vulnerabilities = sum(len(result.vulnerabilities) for result in self.scan_results)
-        critical_count = sum(1 for result in self.scan_results for vuln in result.vulnerabilities if vuln.severity == SecurityThreatLevel.CRITICAL)
-        high_count = sum(1 for result in self.scan_results for vuln in result.vulnerabilities if vuln.severity == SecurityThreatLevel.HIGH)
+        total_vulnerabilities = sum(self.severity_counts.values())
+        critical_count = self.severity_counts[SecurityThreatLevel.CRITICAL]
+        high_count = self.severity_counts[SecurityThreatLevel.HIGH]
         
         # Calculate overall scores
         compliance_scores = [result.compliance_score for result in self.scan_results if result.scan_successful]
@@ -4,10 +4,11 @@ Handles automatic service registration and health checking
 """
 
 import asyncio
+import heapq
 import logging
 import os
 import json
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import aiohttp
@@ -52,7 +53,44 @@ class ServiceRegistry:
 
     def __init__(self):
         self.services: Dict[str, ServiceEntry] = {}
+        # capability -> names of services providing it, in registration order
+        # (dict keys keep insertion order, values are unused)
+        self.capability_index: Dict[str, Dict[str, None]] = {}
         self.heartbeat_timeout = timedelta(seconds=30)  # Services must heartbeat every 30s
+        # Min-heap of (expiry deadline, service name); entries are pushed on every
+        # heartbeat and re-validated when popped, so stale ones are just skipped
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+
+    def _index_capabilities(self, entry: ServiceEntry) -> None:
+        """Add a service to the capability index"""
+        for capability in entry.capabilities:
+            self.capability_index.setdefault(capability, {})[entry.name] = None
+
+    def _rebuild_capability_index(self, capabilities: List[str]) -> None:
+        """Rebuild index entries from the registry so they follow registration order"""
+        for capability in capabilities:
+            self.capability_index[capability] = {
+                name: None for name, entry in self.services.items()
+                if capability in entry.capabilities
+            }
+
+    def _unindex_capabilities(self, entry: ServiceEntry) -> None:
+        """Remove a service from the capability index"""
+        for capability in entry.capabilities:
+            names = self.capability_index.get(capability)
+            if names is not None:
+                names.pop(entry.name, None)
+                if not names:
+                    del self.capability_index[capability]
+
+    def _schedule_expiry(self, entry: ServiceEntry) -> None:
+        """Queue the deadline after which a silent service is removed"""
+        heapq.heappush(self._expiry_heap,
+                       (entry.last_heartbeat + self.heartbeat_timeout * 2, entry.name))
+
+    def _remove_service(self, name: str) -> None:
+        """Drop a service and its index entries"""
+        self._unindex_capabilities(self.services.pop(name))
 
     def register_service(self, name: str, host: str, port: int,
                         capabilities: List[str], health_endpoint: Optional[str] = None,
@@ -66,12 +104,14 @@ class ServiceRegistry:
             name=name,
             host=host,
             port=port,
-            capabilities=capabilities,
+            capabilities=list(capabilities),
             health_endpoint=health_endpoint,
             metadata=metadata or {}
         )
 
         self.services[name] = entry
+        self._index_capabilities(entry)
+        self._schedule_expiry(entry)
         logger.info(f"Registered service: {name} at {host}:{port}")
         return True
 
@@ -81,17 +121,25 @@ class ServiceRegistry:
             return False
 
         entry = self.services[name]
+        reindex = "capabilities" in kwargs
+        if reindex:
+            kwargs["capabilities"] = list(kwargs["capabilities"])
+            self._unindex_capabilities(entry)
         for key, value in kwargs.items():
             if hasattr(entry, key):
                 setattr(entry, key, value)
+        if reindex:
+            # The service keeps its registration position, so re-append is not enough
+            self._rebuild_capability_index(entry.capabilities)
 
         entry.last_heartbeat = datetime.now()
+        self._schedule_expiry(entry)
         return True
 
     def unregister_service(self, name: str) -> bool:
         """Unregister a service"""
         if name in self.services:
-            del self.services[name]
+            self._remove_service(name)
             logger.info(f"Unregistered service: {name}")
             return True
         return False
@@ -102,12 +150,11 @@ class ServiceRegistry:
 
     def list_services(self, capability_filter: Optional[str] = None) -> List[ServiceEntry]:
         """List all registered services"""
-        services = list(self.services.values())
-
         if capability_filter:
-            services = [s for s in services if capability_filter in s.capabilities]
+            return [self.services[name]
+                    for name in self.capability_index.get(capability_filter, ())]
 
-        return services
+        return list(self.services.values())
 
     def check_health(self) -> Dict[str, str]:
         """Check health of all services"""
@@ -126,23 +173,24 @@ class ServiceRegistry:
     async def heartbeat(self, name: str) -> bool:
         """Process heartbeat from service"""
         if name in self.services:
-            self.services[name].last_heartbeat = datetime.now()
-            self.services[name].status = "healthy"
+            entry = self.services[name]
+            entry.last_heartbeat = datetime.now()
+            entry.status = "healthy"
+            self._schedule_expiry(entry)
             return True
         return False
 
     def cleanup_stale_services(self):
         """Remove services that haven't sent heartbeats"""
         now = datetime.now()
-        stale_services = []
 
-        for name, service in self.services.items():
-            if now - service.last_heartbeat > self.heartbeat_timeout * 2:
-                stale_services.append(name)
-
-        for name in stale_services:
-            logger.warning(f"Removing stale service: {name}")
-            del self.services[name]
+        # Only services whose earliest deadline has passed are looked at
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            _, name = heapq.heappop(self._expiry_heap)
+            service = self.services.get(name)
+            if service and now - service.last_heartbeat > self.heartbeat_timeout * 2:
+                logger.warning(f"Removing stale service: {name}")
+                self._remove_service(name)
 
 
 class ServiceDiscoveryMCP(MCPServer):
@@ -151,8 +199,10 @@ class ServiceDiscoveryMCP(MCPServer):
     def __init__(self):
         super().__init__("service-discovery", "1.0.0")
         self.registry = ServiceRegistry()
+        self.cleanup_interval = 60.0  # Clean up every minute
+        self._cleanup_handle: Optional[asyncio.TimerHandle] = None
         self.setup_tools()
-        self._start_cleanup_task()
+        self._schedule_cleanup()
 
     def setup_tools(self):
         """Setup service discovery tools"""
@@ -282,19 +332,25 @@ class ServiceDiscoveryMCP(MCPServer):
             logger.error(f"Error checking health: {e}")
             return {"error": str(e)}
 
-    def _start_cleanup_task(self):
-        """Start periodic cleanup task"""
-        asyncio.create_task(self._cleanup_loop())
+    def _schedule_cleanup(self):
+        """Schedule the next stale-service cleanup on the event loop timer"""
+        loop = asyncio.get_running_loop()
+        self._cleanup_handle = loop.call_later(self.cleanup_interval, self._run_cleanup)
 
-    async def _cleanup_loop(self):
+    def _run_cleanup(self):
         """Periodic cleanup of stale services"""
-        while True:
-            try:
-                self.registry.cleanup_stale_services()
-                await asyncio.sleep(60)  # Clean up every minute
-            except Exception as e:
-                logger.error(f"Error in cleanup loop: {e}")
-                await asyncio.sleep(60)
+        try:
+            self.registry.cleanup_stale_services()
+        except Exception as e:
+            logger.error(f"Error in cleanup: {e}")
+        finally:
+            self._schedule_cleanup()
+
+    def stop_cleanup(self):
+        """Cancel the pending cleanup timer"""
+        if self._cleanup_handle:
+            self._cleanup_handle.cancel()
+            self._cleanup_handle = None
 
 
 async def main():
@@ -327,6 +383,8 @@ async def main():
         await asyncio.Future()  # Run forever
     except KeyboardInterrupt:
         logger.info("Shutting down Service Discovery MCP Server")
+    finally:
+        discovery_server.stop_cleanup()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+"""Unit tests for the automotive bridge's API response encoding"""
+
+import importlib.util
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+MODULE_DIR = Path(__file__).resolve().parents[2] / "modules" / "automotive-mcp-bridge"
+sys.path.insert(0, str(MODULE_DIR))
+
+# Every module ships a main.py, so load this one under its own name
+_spec = importlib.util.spec_from_file_location("automotive_bridge_main",
+                                               MODULE_DIR / "main.py")
+bridge = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bridge)
+
+
+def status_payload():
+    return {
+        "vehicle_state": {
+            "speed_kmh": np.float64(42.5),
+            "engine_rpm": np.float32(1800.0),
+            "gear": np.int64(3),
+            "moving": np.bool_(True),
+            "tire_pressure": np.array([2.2, 2.2, 2.3, 2.3]),
+            "context": bridge.AutomotiveContext.DRIVING,
+            "last_update": datetime(2024, 1, 1, 12, 0, 0)
+        }
+    }
+
+
+EXPECTED = {
+    "vehicle_state": {
+        "speed_kmh": 42.5,
+        "engine_rpm": 1800.0,
+        "gear": 3,
+        "moving": True,
+        "tire_pressure": [2.2, 2.2, 2.3, 2.3],
+        "context": "driving",
+        "last_update": "2024-01-01T12:00:00"
+    }
+}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_status_payload_with_numpy_values_encodes(monkeypatch, use_orjson):
+    """Test status payloads holding numpy scalars and arrays serialize"""
+    framework_globals = bridge.encode_json.__globals__
+    if use_orjson and not framework_globals["ORJSON_AVAILABLE"]:
+        pytest.skip("orjson not installed")
+    monkeypatch.setitem(framework_globals, "ORJSON_AVAILABLE", use_orjson)
+
+    body = bridge.encode_json(status_payload(), default=bridge._json_default)
+
+    assert json.loads(body) == EXPECTED
@@ -0,0 +1,34 @@
+"""Unit tests for the enhanced orchestrator's NLP parameter extraction"""
+
+import sys
+from pathlib import Path
+
+MODULE_DIR = Path(__file__).resolve().parents[2] / "modules" / "core-orchestrator"
+sys.path.insert(0, str(MODULE_DIR))
+
+from enhanced_orchestrator import EnhancedNLPProcessor
+
+
+def test_hardware_action_ignores_trailing_punctuation():
+    """Test hardware actions match keywords followed by punctuation"""
+    processor = EnhancedNLPProcessor()
+    text = "set pin 5 high."
+    
+    params = processor._extract_hardware_params(text, text.split(), None)
+    
+    assert params["pin"] == "5"
+    assert params["action"] == "on"
+
+
+def test_file_action_matches_inflected_verbs():
+    """Test file actions match inflected verbs and keep priority order"""
+    processor = EnhancedNLPProcessor()
+    
+    for text, action in [("downloading the report", "download"),
+                         ("i saved it to /tmp/notes.txt", "save"),
+                         ("save and then delete the file", "delete")]:
+        params = processor._extract_file_params(text, text.split(), None)
+        assert params["action"] == action
+    
+    params = processor._extract_file_params("recreate it", ["recreate", "it"], None)
+    assert "action" not in params
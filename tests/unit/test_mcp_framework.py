@@ -2,7 +2,9 @@
 
 import pytest
 import asyncio
-from modules.mcp_framework import MCPServer, MCPMessage, Tool, create_tool
+from modules.mcp_framework import (
+    HTTPTransport, MCPError, MCPServer, MCPMessage, Tool, create_tool
+)
 
 
 @pytest.mark.asyncio
@@ -24,6 +26,23 @@ async def test_mcp_message_creation():
     assert "test/method" in json_str
 
 
+def test_mcp_message_json_roundtrip():
+    """Test MCP message JSON round-trip keeps non-ASCII payloads intact"""
+    message = MCPMessage(
+        id=7,
+        method="tools/call",
+        params={"name": "speak", "arguments": {"text": "Dobrý den"}}
+    )
+    
+    json_str = message.to_json()
+    assert isinstance(json_str, str)
+    
+    parsed = MCPMessage.from_json(json_str)
+    assert parsed.id == 7
+    assert parsed.params == message.params
+    assert MCPMessage.from_json(json_str.encode("utf-8")).to_dict() == message.to_dict()
+
+
 def test_tool_creation():
     """Test tool creation"""
     def dummy_handler(param1: str) -> str:
@@ -55,3 +74,64 @@ async def test_mcp_server_initialization():
     assert server.version == "1.0.0"
     assert len(server.tools) == 0
     assert not server.initialized
+
+
+@pytest.mark.asyncio
+async def test_tools_list_reflects_added_tools():
+    """Test tools/list picks up tools registered after a previous listing"""
+    server = MCPServer("test-server", "1.0.0")
+    server.add_tool(create_tool("first", "First tool", {"type": "object"}, handler=None))
+    
+    response = await server.handle_message(MCPMessage(id=1, method="tools/list"))
+    assert [tool["name"] for tool in response.result["tools"]] == ["first"]
+    
+    server.add_tool(create_tool("second", "Second tool", {"type": "object"}, handler=None))
+    response = await server.handle_message(MCPMessage(id=2, method="tools/list"))
+    assert [tool["name"] for tool in response.result["tools"]] == ["first", "second"]
+
+
+class FakeResponse:
+    """Minimal aiohttp response stand-in for HTTPTransport tests"""
+
+    def __init__(self, status):
+        self.status = status
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Records POSTs and answers them with a fixed status"""
+
+    def __init__(self, status):
+        self.status = status
+        self.posts = []
+
+    def post(self, url, data=None, headers=None):
+        self.posts.append((url, data))
+        return FakeResponse(self.status)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [200, 201, 202, 204])
+async def test_http_transport_accepts_2xx(status):
+    """Test HTTP transport treats any 2xx reply as delivered"""
+    session = FakeSession(status)
+    transport = HTTPTransport(session, "http://localhost:8080/mcp")
+    
+    await transport.send(MCPMessage(id=1, method="ping"))
+    
+    assert len(session.posts) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [301, 404, 500])
+async def test_http_transport_raises_on_non_2xx(status):
+    """Test HTTP transport raises on non-2xx replies"""
+    transport = HTTPTransport(FakeSession(status), "http://localhost:8080/mcp")
+    
+    with pytest.raises(MCPError):
+        await transport.send(MCPMessage(id=1, method="ping"))
@@ -0,0 +1,79 @@
+"""Unit tests for the service discovery registry's capability index"""
+
+import importlib.util
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+MODULE_DIR = Path(__file__).resolve().parents[2] / "modules" / "service-discovery"
+sys.path.insert(0, str(MODULE_DIR))
+
+# Every module ships a main.py, so load this one under its own name
+_spec = importlib.util.spec_from_file_location("service_discovery_main",
+                                               MODULE_DIR / "main.py")
+service_discovery = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(service_discovery)
+
+
+def scan(registry, capability):
+    """Reference result: filter the registry in registration order"""
+    return [entry.name for entry in registry.services.values()
+            if capability in entry.capabilities]
+
+
+def listed(registry, capability):
+    return [entry.name for entry in registry.list_services(capability)]
+
+
+def test_register_keeps_registration_order():
+    """Test capability lookups return services in registration order"""
+    registry = service_discovery.ServiceRegistry()
+    for name in ["a", "b", "zz", "q"]:
+        registry.register_service(name, "localhost", 8000, ["x"])
+
+    assert listed(registry, "x") == scan(registry, "x") == ["a", "b", "zz", "q"]
+    assert listed(registry, "missing") == []
+
+
+def test_register_copies_capabilities():
+    """Test the registry does not alias the caller's capabilities list"""
+    registry = service_discovery.ServiceRegistry()
+    capabilities = ["x"]
+    registry.register_service("a", "localhost", 8000, capabilities)
+    capabilities.append("y")
+
+    assert listed(registry, "y") == scan(registry, "y") == []
+
+
+def test_update_with_changed_capabilities():
+    """Test updated capabilities are re-indexed without moving the service"""
+    registry = service_discovery.ServiceRegistry()
+    registry.register_service("a", "localhost", 8000, ["x"])
+    registry.register_service("b", "localhost", 8001, ["x", "y"])
+    registry.register_service("c", "localhost", 8002, ["y"])
+
+    registry.update_service("a", capabilities=["y"])
+    assert listed(registry, "x") == scan(registry, "x") == ["b"]
+    assert listed(registry, "y") == scan(registry, "y") == ["a", "b", "c"]
+
+    registry.update_service("a", capabilities=["x", "y"])
+    for capability in ["x", "y"]:
+        assert listed(registry, capability) == scan(registry, capability)
+
+
+def test_unregister_and_expiry_drop_index_entries():
+    """Test removed and expired services disappear from capability lookups"""
+    registry = service_discovery.ServiceRegistry()
+    registry.register_service("a", "localhost", 8000, ["x"])
+    registry.register_service("b", "localhost", 8001, ["x"])
+
+    assert registry.unregister_service("a")
+    assert listed(registry, "x") == scan(registry, "x") == ["b"]
+
+    # A negative timeout makes every deadline already due
+    registry.heartbeat_timeout = timedelta(seconds=-1)
+    registry.register_service("c", "localhost", 8002, ["x"])
+    registry.cleanup_stale_services()
+
+    assert listed(registry, "x") == scan(registry, "x") == ["b"]
+    assert "x" in registry.capability_index